@@ -0,0 +1,90 @@
+"""
+Compare the sync and async APIs on a stand-in for a high-latency filesystem:
+a local directory, where every open, stat, listing and rename sleeps first.
+
+Run with:
+
+    python -m benchmarks.bench_async [count] [latency in ms]
+"""
+import asyncio
+import builtins
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+from unittest.mock import patch
+
+from benchmarks.synth import make_directory
+from pisort.async_pictures import async_list_pictures, async_sort_pictures
+from pisort.list_pictures import list_pictures
+from pisort.sort_pictures import sort_pictures
+
+
+def slow(function: Callable, latency: float) -> Callable:
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def latency(seconds: float) -> Iterator[None]:
+    """
+    Make every open, stat, listing and rename take `seconds` longer.
+    """
+    with contextlib.ExitStack() as stack:
+        for target, function in [
+            (builtins, "open"),
+            (io, "open"),
+            (os, "stat"),
+            (os, "scandir"),
+            (os, "rename"),
+        ]:
+            stack.enter_context(patch.object(target, function, slow(getattr(target, function), seconds)))
+        yield
+
+
+def bench(name: str, source: Path, work: Callable[[Path], tuple[int, float, float]], seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        directory = Path(tempdir) / "pictures"
+        shutil.copytree(source, directory, copy_function=os.link)
+        with latency(seconds):
+            count, listing, sorting = work(directory)
+    print(f"{name:16} {count:6} pictures listed in {listing:6.2f} s, sorted in {sorting:6.2f} s")
+
+
+def sync_sort(jobs: int) -> Callable[[Path], tuple[int, float, float]]:
+    def work(directory: Path) -> tuple[int, float, float]:
+        start = time.perf_counter()
+        pictures = list_pictures(directory, jobs=jobs)
+        listed = time.perf_counter()
+        sort_pictures(pictures)
+        return len(pictures), listed - start, time.perf_counter() - listed
+    return work
+
+
+def async_sort(jobs: int) -> Callable[[Path], tuple[int, float, float]]:
+    async def work(directory: Path) -> tuple[int, float, float]:
+        start = time.perf_counter()
+        pictures = await async_list_pictures(directory, jobs=jobs)
+        listed = time.perf_counter()
+        await async_sort_pictures(pictures, jobs=jobs)
+        return len(pictures), listed - start, time.perf_counter() - listed
+    return lambda directory: asyncio.run(work(directory))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = (float(sys.argv[2]) if len(sys.argv) > 2 else 10) / 1000
+    with tempfile.TemporaryDirectory() as tempdir:
+        source = Path(tempdir)
+        make_directory(source, count)
+        bench("sync", source, sync_sort(1), seconds)
+        for jobs in [8, 32]:
+            bench(f"sync, {jobs} jobs", source, sync_sort(jobs), seconds)
+            bench(f"async, {jobs} jobs", source, async_sort(jobs), seconds)
@@ -0,0 +1,54 @@
+"""
+Compare the parsing of Exif date tags by `exif_date` with strptime and a new
+time zone per picture, as it was done before.
+
+Run with:
+
+    python -m benchmarks.bench_dates [count]
+"""
+import datetime
+import random
+import sys
+import time
+
+from pisort.Picture import exif_date
+from pisort.parse_datetime import exif_datetime_format
+from pisort.parse_offset import parse_offset
+
+offsets = ["+00:00", "+01:00", "+02:00", "-05:00", "-07:00", "+05:30", "   :  "]
+
+
+def samples(count: int) -> list[dict[str, str]]:
+    rng = random.Random(0)
+    start = datetime.datetime(2000, 1, 1)
+    values = []
+    for _ in range(count):
+        date = start + datetime.timedelta(seconds=rng.randrange(25 * 365 * 86400))
+        values.append({
+            "EXIF DateTimeOriginal": date.strftime(exif_datetime_format),
+            "EXIF OffsetTimeOriginal": rng.choice(offsets),
+        })
+    return values
+
+
+def reference_date(values: dict[str, str]) -> datetime.datetime:
+    date = datetime.datetime.strptime(values["EXIF DateTimeOriginal"], exif_datetime_format)
+    return date.replace(tzinfo=parse_offset.__wrapped__(values["EXIF OffsetTimeOriginal"]))
+
+
+def bench(parse, values: list[dict[str, str]]) -> float:
+    start = time.perf_counter()
+    for value in values:
+        parse(value)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    values = samples(count)
+    assert [reference_date(value) for value in values] == [exif_date(value) for value in values]
+    before = bench(reference_date, values)
+    after = bench(exif_date, values)
+    print(f"{count} dates")
+    print(f"strptime:  {before / count * 1e6:6.2f} µs/date")
+    print(f"exif_date: {after / count * 1e6:6.2f} µs/date ({before / after:.2f}x)")
@@ -0,0 +1,53 @@
+"""
+Compare finding duplicates by staged grouping (date, size, hash of the first
+kilobytes, full hash) with hashing every file whole, on a synthetic directory
+where 1% of the pictures were copied twice.
+
+Run with:
+
+    python -m benchmarks.bench_dedupe [count] [size in KiB]
+"""
+import hashlib
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks.synth import make_directory
+from pisort.Picture import Picture
+from pisort.Stats import Stats
+from pisort.dedupe import find_duplicates
+from pisort.list_pictures import list_pictures
+
+
+def hash_everything(pictures: list[Picture]) -> list[list[Picture]]:
+    groups = defaultdict(list)
+    for picture in pictures:
+        groups[hashlib.blake2b(picture.path.read_bytes()).digest()].append(picture)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    with tempfile.TemporaryDirectory() as tempdir:
+        directory = Path(tempdir)
+        paths = make_directory(directory, count, size=size * 1024)
+        for path in paths[::100]:
+            shutil.copyfile(path, path.with_stem(path.stem + " copy"))
+        pictures = list_pictures(directory)
+
+        start = time.perf_counter()
+        naive = hash_everything(pictures)
+        elapsed = time.perf_counter() - start
+        total = sum(picture.path.stat().st_size for picture in pictures)
+        print(f"hash all  {len(naive):6} groups in {elapsed:7.2f} s, {total / 1024 / 1024:9.1f} MiB hashed")
+
+        stats = Stats()
+        start = time.perf_counter()
+        staged = find_duplicates(pictures, stats)
+        elapsed = time.perf_counter() - start
+        hashed = stats.report()["counters"].get("bytes hashed", 0)
+        print(f"staged    {len(staged):6} groups in {elapsed:7.2f} s, {hashed / 1024 / 1024:9.1f} MiB hashed")
@@ -0,0 +1,46 @@
+"""
+Compare the date-only Exif extraction of `Picture` with a full parse, on
+JPEG files, and on TIFF files with their Exif metadata at the end.
+
+Run with:
+
+    python -m benchmarks.bench_exif [count] [size in MiB]
+"""
+import datetime
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synth import make_deep_tiff, make_jpeg
+from pisort.Picture import Picture
+
+
+def bench(paths: list[Path], details: bool) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        Picture(path, details=details).date()
+    return time.perf_counter() - start
+
+
+def compare(kind: str, paths: list[Path], size: int) -> None:
+    full = bench(paths, details=True)
+    fast = bench(paths, details=False)
+    print(f"{len(paths)} {kind} files of {size} MiB")
+    print(f"full parse: {full / len(paths) * 1e6:8.1f} µs/file")
+    print(f"date only:  {fast / len(paths) * 1e6:8.1f} µs/file ({full / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    date = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    with tempfile.TemporaryDirectory() as tempdir:
+        compare("JPEG", [
+            make_jpeg(Path(tempdir) / f"{i}.jpg", size * 1024 * 1024)
+            for i in range(count)
+        ], size)
+        compare("deep TIFF", [
+            make_deep_tiff(Path(tempdir) / f"{i}.tif", date, size * 1024 * 1024)
+            for i in range(count)
+        ], size)
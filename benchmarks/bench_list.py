@@ -0,0 +1,70 @@
+"""
+Compare listing pictures into a list with streaming them, on a synthetic
+directory of small files.
+
+Run with:
+
+    python -m benchmarks.bench_list [count]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable
+
+from benchmarks.synth import fixtures
+from pisort.Picture import Picture
+from pisort.exceptions import NoExifDataException
+from pisort.list_pictures import iter_pictures, list_pictures
+
+sources = [
+    fixtures / "original_2020-01-01T00:00:00+00:00.png",
+    fixtures / "digitized_2023-08-01T20:00:00-07:00.png",
+    fixtures / "modified_2023-08-13T21:47:50+02:00.png",
+    fixtures / "no-date.png",
+]
+
+
+def legacy_list_pictures(directory: Path) -> list[Picture]:
+    """
+    List pictures the way list_pictures did before it was streamed, keeping
+    the Exif tags of each picture.
+    """
+    result = []
+    for file in directory.iterdir():
+        if not file.is_file():
+            continue
+        try:
+            pic = Picture(file, keep_exif=True)
+            if pic.date() is not None:
+                result.append(pic)
+        except NoExifDataException:
+            pass
+    return result
+
+
+def consume(pictures: Iterable[Picture]) -> int:
+    return sum(1 for _ in pictures)
+
+
+def bench(name: str, scan: Callable[[], Iterable[Picture]]) -> None:
+    start = time.perf_counter()
+    count = consume(scan())
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    consume(scan())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:8} {count} pictures in {elapsed:7.2f} s, peak {peak / 1024 / 1024:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tempdir:
+        directory = Path(tempdir)
+        for i in range(count):
+            (directory / f"{i}.png").hardlink_to(sources[i % len(sources)])
+        bench("legacy", lambda: legacy_list_pictures(directory))
+        bench("list", lambda: list_pictures(directory))
+        bench("iter", lambda: iter_pictures(directory))
@@ -0,0 +1,70 @@
+"""
+Compare the number of renames, and their duration, of the two-phase strategy
+(every file to a temporary name, then to its final name) with the minimal
+rename planner.
+
+Run with:
+
+    python -m benchmarks.bench_plan [count]
+"""
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from pisort.Journal import Journal, Rename, snapshot
+from pisort.plan_renames import plan_renames
+
+
+def two_phase(moves: dict[str, str], inodes: dict[str, int]) -> list[list[Rename]]:
+    temp_names = {source: str(uuid.uuid4()) for source in moves}
+    return [
+        [Rename(source, temp_names[source], inodes[source]) for source in moves]
+        + [Rename(temp_names[source], target, inodes[source]) for source, target in moves.items()]
+    ]
+
+
+def scenarios(count: int) -> dict[str, tuple[list[str], dict[str, str]]]:
+    """
+    :return: the initial file names, and the target name of each file, by
+      scenario.
+    """
+    width = len(str(count))
+    sorted_names = [f"{i:0{width}}.jpg" for i in range(count)]
+    swapped = list(sorted_names)
+    for i in range(0, count - 1, 100):
+        swapped[i], swapped[i + 1] = swapped[i + 1], swapped[i]
+    return {
+        "sorted": (sorted_names, {name: name for name in sorted_names}),
+        "append": (
+            sorted_names[:-1] + ["new.jpg"],
+            {name: name for name in sorted_names[:-1]} | {"new.jpg": sorted_names[-1]},
+        ),
+        "1% swapped": (sorted_names, dict(zip(sorted_names, swapped))),
+        "prepend": (
+            ["new.jpg"] + sorted_names[:-1],
+            {"new.jpg": sorted_names[0]} | dict(zip(sorted_names[:-1], sorted_names[1:])),
+        ),
+    }
+
+
+def bench(directory: Path, names: list[str], moves: dict[str, str], planner) -> tuple[int, float]:
+    for name in names:
+        (directory / name).touch()
+    sequences = planner(moves, snapshot(directory))
+    start = time.perf_counter()
+    Journal(directory).run(sequences)
+    elapsed = time.perf_counter() - start
+    for path in directory.iterdir():
+        path.unlink()
+    return sum(len(sequence) for sequence in sequences), elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tempdir:
+        for scenario, (names, moves) in scenarios(count).items():
+            for planner in [two_phase, plan_renames]:
+                operations, elapsed = bench(Path(tempdir), names, moves, planner)
+                print(f"{scenario:12} {planner.__name__:12} {operations:8} renames in {elapsed:6.3f} s")
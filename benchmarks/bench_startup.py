@@ -0,0 +1,59 @@
+"""
+Measure the startup time of the command line tools, by running their --help,
+and list the third party modules they import to get there.
+
+Run with:
+
+    python -m benchmarks.bench_startup [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pisort
+
+commands = {
+    "pisort": ["-m", "pisort.pisort", "--help"],
+    "set_datetime": ["-m", "pisort.set_datetime", "--help"],
+    "python": ["-c", "pass"],
+}
+
+heavy_modules = ["exifread", "piexif", "tzlocal", "sqlite3", "concurrent.futures"]
+
+
+def environment() -> dict[str, str]:
+    path = str(Path(pisort.__path__[0]).parent)
+    return os.environ | {"PYTHONPATH": path}
+
+
+def run(arguments: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *arguments], env=environment(), stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def imported(arguments: list[str]) -> list[str]:
+    """
+    :return: the modules among `heavy_modules` imported by the command.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        env=environment(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    modules = {line.split("|")[-1].strip() for line in process.stderr.splitlines()}
+    return [module for module in heavy_modules if module in modules]
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for name, arguments in commands.items():
+        median = statistics.median(run(arguments) for _ in range(runs))
+        heavy = ", ".join(imported(arguments)) or "-"
+        print(f"{name:14} {median * 1000:7.1f} ms   imports: {heavy}")
@@ -0,0 +1,35 @@
+"""
+Measure the dating of large MP4 videos, whose movie header comes after the
+media data, and how many bytes are read to find it.
+
+Run with:
+
+    python -m benchmarks.bench_video [count] [size in GiB]
+"""
+import datetime
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synth import make_mp4
+from pisort.Picture import Picture
+from pisort.Stats import Stats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    date = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    with tempfile.TemporaryDirectory() as tempdir:
+        paths = [
+            make_mp4(Path(tempdir) / f"{i}.mp4", date, size * 1024 * 1024 * 1024)
+            for i in range(count)
+        ]
+        stats = Stats()
+        start = time.perf_counter()
+        for path in paths:
+            assert Picture(path, stats=stats).date() == date
+        elapsed = time.perf_counter() - start
+    print(f"{count} MP4 files of {size} GiB")
+    print(f"{elapsed / count * 1e6:8.1f} µs/file, {stats.counters['bytes read'] / count:.0f} bytes read/file")
@@ -0,0 +1,36 @@
+"""
+Compare two result files of benchmarks.suite.
+
+Run with:
+
+    python -m benchmarks.compare <baseline.json> <candidate.json>
+"""
+import json
+import sys
+
+
+def key(result: dict) -> tuple:
+    return result["format"], result["count"], result["size"], result["phase"]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"usage: {sys.argv[0]} <baseline.json> <candidate.json>", file=sys.stderr)
+        exit(1)
+    with open(sys.argv[1]) as f:
+        baseline = json.load(f)
+    with open(sys.argv[2]) as f:
+        candidate = json.load(f)
+    baseline_results = {key(result): result for result in baseline["results"]}
+    print(f"baseline:  {baseline['commit']}")
+    print(f"candidate: {candidate['commit']}")
+    print(f"{'format':8} {'count':>7} {'phase':8} {'baseline':>10} {'candidate':>10} {'ratio':>7}")
+    for result in candidate["results"]:
+        before = baseline_results.get(key(result))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] > 0 else float("nan")
+        print(
+            f"{result['format']:8} {result['count']:7} {result['phase']:8}"
+            f" {before['seconds']:10.4f} {result['seconds']:10.4f} {ratio:7.2f}"
+        )
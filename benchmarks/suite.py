@@ -0,0 +1,119 @@
+"""
+Time each phase of a sort on synthesized directories, and output the results
+as JSON, to compare them across commits with benchmarks.compare.
+
+Run with:
+
+    python -m benchmarks.suite [options]
+
+Options:
+ -c,--count <n>      Number of pictures per directory (default: 2000).
+ -s,--size <bytes>   Minimum size of each picture (default: 0).
+ -r,--repeat <n>     Number of runs of each phase, keeping the fastest
+                     (default: 3).
+ -o,--output <file>  Write results to <file> instead of the standard output.
+"""
+import getopt
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from benchmarks.synth import formats, make_directory
+from pisort.list_pictures import load_picture
+from pisort.sort_pictures import plan_sort, rename_pictures
+
+phases = ["scan", "dates", "plan", "rename"]
+
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(function: Callable[[], object]) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run_phases(directory: Path, count: int, format: Optional[str], size: int) -> dict[str, float]:
+    """
+    Synthesize a directory, then time each phase of its sort once.
+    """
+    for path in directory.iterdir():
+        path.unlink()
+    make_directory(directory, count, format, size)
+    timings = {}
+    # Each phase starts from the result of the previous one, so that none
+    # is timed twice
+    timings["scan"], names = timed(lambda: [entry.name for entry in os.scandir(directory) if entry.is_file()])
+    timings["dates"], pictures = timed(lambda: [
+        picture for name in names if (picture := load_picture(directory / name)) is not None
+    ])
+    timings["plan"], plan = timed(lambda: plan_sort(pictures))
+    timings["rename"], _ = timed(lambda: rename_pictures(plan))
+    return timings
+
+
+def run(count: int, size: int, repeat: int) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tempdir:
+        for format in formats + [None]:
+            best: dict[str, float] = {}
+            for _ in range(repeat):
+                for phase, seconds in run_phases(Path(tempdir), count, format, size).items():
+                    best[phase] = min(seconds, best.get(phase, seconds))
+            for phase in phases:
+                results.append({
+                    "format": format or "mixed",
+                    "count": count,
+                    "size": size,
+                    "phase": phase,
+                    "seconds": best[phase],
+                    "files_per_second": count / best[phase] if best[phase] > 0 else None,
+                })
+    return {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    options, _ = getopt.getopt(sys.argv[1:], "c:s:r:o:", ["count=", "size=", "repeat=", "output="])
+    count = 2000
+    size = 0
+    repeat = 3
+    output = None
+    for k, v in options:
+        match k:
+            case "-c" | "--count":
+                count = int(v)
+            case "-s" | "--size":
+                size = int(v)
+            case "-r" | "--repeat":
+                repeat = int(v)
+            case "-o" | "--output":
+                output = v
+    report = run(count, size, repeat)
+    if output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
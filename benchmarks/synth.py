@@ -0,0 +1,206 @@
+"""
+Helpers to synthesize pictures for benchmarks.
+"""
+import datetime
+import io
+import random
+import shutil
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import piexif
+
+fixtures = Path(__file__).parent.parent / "tests"
+sample = fixtures / "sample.jpg"
+
+formats = ["jpeg", "png", "tiff"]
+layouts = ["original", "digitized", "modified", "no-offset", "no-date"]
+"""
+Where the date of a synthesized picture is stored:
+ - original: DateTimeOriginal and OffsetTimeOriginal, with other dates,
+ - digitized: DateTimeDigitized and OffsetTimeDigitized,
+ - modified: DateTime and OffsetTime,
+ - no-offset: DateTimeOriginal only,
+ - no-date: no date at all.
+"""
+
+
+def make_jpeg(path: Path, size: int = 0) -> Path:
+    """
+    Write a copy of the sample camera JPEG (with MakerNote and thumbnail) to
+    `path`, padded after the end of image marker so that it is at least `size`
+    bytes long, like a full-resolution camera picture.
+    """
+    shutil.copyfile(sample, path)
+    padding = size - path.stat().st_size
+    if padding > 0:
+        with path.open("ab") as f:
+            f.truncate(size)
+    return path
+
+
+def make_exif(date: datetime.datetime, layout: str) -> bytes:
+    """
+    :return: Exif metadata, starting with the "Exif\\0\\0" APP1 header.
+    """
+    value = date.strftime("%Y:%m:%d %H:%M:%S")
+    offset = date.strftime("%z")
+    offset = offset[:3] + ":" + offset[3:]
+    image: dict[int, object] = {piexif.ImageIFD.Make: "pisort", piexif.ImageIFD.Model: "benchmark"}
+    exif: dict[int, object] = {piexif.ExifIFD.ExposureTime: (1, 100)}
+    match layout:
+        case "original":
+            image[piexif.ImageIFD.DateTime] = value
+            exif[piexif.ExifIFD.DateTimeOriginal] = value
+            exif[piexif.ExifIFD.DateTimeDigitized] = value
+            exif[piexif.ExifIFD.OffsetTime] = offset
+            exif[piexif.ExifIFD.OffsetTimeOriginal] = offset
+            exif[piexif.ExifIFD.OffsetTimeDigitized] = offset
+        case "digitized":
+            exif[piexif.ExifIFD.DateTimeDigitized] = value
+            exif[piexif.ExifIFD.OffsetTimeDigitized] = offset
+        case "modified":
+            image[piexif.ImageIFD.DateTime] = value
+            exif[piexif.ExifIFD.OffsetTime] = offset
+        case "no-offset":
+            exif[piexif.ExifIFD.DateTimeOriginal] = value
+        case "no-date":
+            pass
+    return piexif.dump({"0th": image, "Exif": exif})
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def make_png(path: Path, exif: bytes, size: int = 0) -> Path:
+    """
+    Write a 1x1 PNG with the given Exif metadata in an eXIf chunk, and an
+    ancillary chunk to reach `size` bytes.
+    """
+    chunks = [
+        png_chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)),
+        png_chunk(b"eXIf", exif[6:]),
+        png_chunk(b"IDAT", zlib.compress(b"\0\0\0\0")),
+    ]
+    padding = size - 8 - sum(len(chunk) for chunk in chunks) - 12 - 12
+    if padding > 0:
+        chunks.insert(2, png_chunk(b"zzZz", bytes(padding)))
+    chunks.append(png_chunk(b"IEND", b""))
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"".join(chunks))
+    return path
+
+
+def make_tiff(path: Path, exif: bytes, size: int = 0) -> Path:
+    """
+    Write a TIFF file made of the given Exif metadata, followed by zeros
+    standing for image data up to `size` bytes.
+    """
+    with path.open("wb") as f:
+        f.write(exif[6:])
+        f.truncate(max(size, len(exif) - 6))
+    return path
+
+
+def make_deep_tiff(path: Path, date: datetime.datetime, size: int) -> Path:
+    """
+    Write a little endian TIFF file of `size` bytes, with zeros standing for
+    image data first, and its IFDs with the date tags at the very end, as in
+    some RAW files.
+    """
+    value = date.strftime("%Y:%m:%d %H:%M:%S").encode() + b"\0"
+    offset = date.strftime("%z")
+    offset = (offset[:3] + ":" + offset[3:]).encode() + b"\0"
+    ifd0 = max(size - 128, 8)
+    exif_ifd = ifd0 + 2 + 2 * 12 + 4
+    values = exif_ifd + 2 + 2 * 12 + 4
+    tail = b"".join([
+        struct.pack("<H", 2),
+        struct.pack("<HHII", 0x0132, 2, len(value), values),
+        struct.pack("<HHII", 0x8769, 4, 1, exif_ifd),
+        struct.pack("<I", 0),
+        struct.pack("<H", 2),
+        struct.pack("<HHII", 0x9003, 2, len(value), values),
+        struct.pack("<HHI4s", 0x9011, 2, len(offset), offset[:4].ljust(4, b"\0"))
+        if len(offset) <= 4 else struct.pack("<HHII", 0x9011, 2, len(offset), values + len(value)),
+        struct.pack("<I", 0),
+        value,
+        offset,
+    ])
+    with path.open("wb") as f:
+        f.write(b"II*\0" + struct.pack("<I", ifd0))
+        f.seek(ifd0)
+        f.write(tail)
+    return path
+
+
+def make_mp4(path: Path, date: datetime.datetime, size: int) -> Path:
+    """
+    Write a sparse MP4 file of at least `size` bytes, with zeros standing for
+    media data first, and its movie header at the very end, as recorded by
+    most cameras.
+    """
+    seconds = int((date - datetime.datetime(1904, 1, 1, tzinfo=datetime.timezone.utc)).total_seconds())
+    mvhd = struct.pack(">I4sIIIII", 28, b"mvhd", 0, seconds, seconds, 1000, 0)
+    with path.open("wb") as f:
+        f.write(struct.pack(">I4s8s", 16, b"ftyp", b"isom\0\0\0\0"))
+        f.write(struct.pack(">I4sQ", 1, b"mdat", 16 + size))
+        f.seek(size, 1)
+        f.write(struct.pack(">I4s", 8 + len(mvhd), b"moov") + mvhd)
+    return path
+
+
+def make_picture(
+        path: Path,
+        format: str,
+        layout: str,
+        date: datetime.datetime,
+        size: int = 0,
+) -> Path:
+    exif = make_exif(date, layout)
+    match format:
+        case "jpeg":
+            output = io.BytesIO()
+            piexif.insert(exif, sample.read_bytes(), output)
+            path.write_bytes(output.getvalue())
+            if size > path.stat().st_size:
+                with path.open("ab") as f:
+                    f.truncate(size)
+            return path
+        case "png":
+            return make_png(path, exif, size)
+        case "tiff":
+            return make_tiff(path, exif, size)
+    raise ValueError(f"Unknown format: {format}")
+
+
+def make_directory(
+        directory: Path,
+        count: int,
+        format: Optional[str] = None,
+        size: int = 0,
+        seed: int = 0,
+) -> list[Path]:
+    """
+    Fill a directory with `count` pictures with random names, dates and date
+    layouts, of the given format or of every format.
+    """
+    rng = random.Random(seed)
+    suffixes = {"jpeg": ".jpg", "png": ".png", "tiff": ".tif"}
+    epoch = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+    paths = []
+    for i in range(count):
+        picture_format = format or formats[i % len(formats)]
+        tz = datetime.timezone(datetime.timedelta(minutes=30 * rng.randint(-24, 28)))
+        date = (epoch + datetime.timedelta(seconds=rng.randint(0, 25 * 365 * 86400))).astimezone(tz)
+        name = f"{rng.getrandbits(64):016x}{suffixes[picture_format]}"
+        paths.append(make_picture(
+            directory / name,
+            picture_format,
+            layouts[i % len(layouts)],
+            date,
+            size,
+        ))
+    return paths
@@ -11,53 +11,169 @@ class Arguments:
             print(f"{argv[0]}: {msg}", file=sys.stderr)
             exit(1)
 
-        options, parameters = getopt(argv[1:], "h", [
+        options, parameters = getopt(argv[1:], "hj:nr", [
+            "dedupe",
+            "dry-run",
+            "jobs=",
             "name=",
+            "no-cache",
             "no-keep",
             "keep",
+            "merge=",
+            "poll=",
+            "recursive",
+            "resume",
+            "rollback",
+            "stats",
+            "stats-file=",
+            "watch",
             "help",
         ])
 
         self.name = None
         self.keep_good_names = True
+        self.jobs = 1
+        self.cache = True
+        self.recursive = False
+        self.recover = None
+        self.dry_run = False
+        self.dedupe = False
+        self.stats = False
+        self.stats_file = None
+        self.watch = False
+        self.poll = None
+        self.merge = None
         for k, v in options:
             match k:
+                case "--dedupe":
+                    self.dedupe = True
+                case "-n" | "--dry-run":
+                    self.dry_run = True
+                case "-j" | "--jobs":
+                    if not (v.isascii() and v.isdigit()) or int(v) < 1:
+                        fatal(f"Invalid number of jobs: {v}")
+                    self.jobs = int(v)
                 case "--name":
                     self.name = v
+                case "--no-cache":
+                    self.cache = False
                 case "--no-keep":
                     self.keep_good_names = False
                 case "--keep":
                     self.keep_good_names = True
+                case "--merge":
+                    self.merge = Path(v)
+                case "--poll":
+                    try:
+                        self.poll = float(v)
+                    except ValueError:
+                        fatal(f"Invalid polling interval: {v}")
+                    if not self.poll > 0:
+                        fatal(f"Invalid polling interval: {v}")
+                    self.watch = True
+                case "-r" | "--recursive":
+                    self.recursive = True
+                case "--resume" | "--rollback":
+                    self.recover = k[2:]
+                case "--stats":
+                    self.stats = True
+                case "--stats-file":
+                    self.stats_file = Path(v)
+                case "--watch":
+                    self.watch = True
                 case "-h" | "--help":
                     print(f"""\
 usage: {argv[0]} [options] [directory]
+       {argv[0]} [options] --recursive [directories...]
+       {argv[0]} [options] --merge <target> directories...
 
 Sort files with Exif dates from a directory in chronological order. If
 unspecified, this directory defaults to the working directory.
 
+With --recursive, every folder below the given directories (including
+themselves) is sorted on its own. Hidden folders are skipped.
+
 Files with no Exif metadata or no date in their metadata will be ignored.
+MP4 and MOV videos are sorted with the pictures, after the creation time
+of their container.
+
+With --merge, folders already sorted are combined into <target>, numbered
+in one sequence. Files keep the order given by their number, so only the
+dates of the first and last files of each folder are read, and those of
+the files of folders spanning the same dates.
 
 Options:
  -h,--help      Display this help message.
+ --dedupe       Leave files with the same content as another out of the
+                numbering, rename them after the file they duplicate with a
+                "~dup<n>" suffix, such as "0~dup1.jpg", and print them. Only
+                files with the same date and size are compared.
+ -n,--dry-run   Don’t rename anything, but print the renames that would be
+                performed as JSON Lines, with "source", "target" and "date"
+                members, and "conflict" set to true for renames that would
+                overwrite another file.
+ -j,--jobs <n>  Read up to <n> files concurrently (default: 1). This mostly
+                helps on network storage. With --recursive, sort up to <n>
+                folders concurrently instead.
  --keep         Keep the name part of files whose filename matches
                 "<number> - <name>" (this is the default). Such files are still
                 renumbered. This is useful when files were each given a
                 different name and need renumbering because other files were
                 added or removed from the directory. This option allows
                 overwriting a previous --no-keep option.
+ --merge <target>
+                Move the files numbered "<number>" or "<number> - <name>" of
+                the given directories into <target>, created if needed. The
+                move is not journaled, and the directories must be on the same
+                filesystem as <target>.
  --name <arg>   Set a name to give files in addition of their index.
- --no-keep      Always discard existing filenames. See the --keep option.""")
+ --no-cache     Read the date of every file, instead of reusing the dates
+                found by previous runs for unchanged files. The cache is
+                stored in $XDG_CACHE_HOME/pisort.
+ --no-keep      Always discard existing filenames. See the --keep option.
+ --poll <seconds>
+                Like --watch, but scan the directories every <seconds>
+                instead of being notified of changes. This is also what
+                --watch does, every 10 seconds, where inotify isn’t available.
+ -r,--recursive Sort each folder of the given directory trees.
+ --resume       Complete an interrupted sort of the directory, instead of
+                sorting it.
+ --rollback     Undo an interrupted sort of the directory, instead of sorting
+                it.
+ --stats        Print the time spent in each phase, counters, and the slowest
+                files to the standard error when done.
+ --stats-file <file>
+                Write the same statistics as --stats to <file>, as JSON.
+ --watch        Keep running after sorting, and sort again as files are added,
+                changed or removed. Only new or changed files are read, and
+                only files whose index changed are renamed. Changes are
+                handled once files were left untouched for 2 seconds. With
+                --recursive, folders created afterwards aren’t watched.""")
                     exit(0)
 
-        if len(parameters) > 1:
+        if self.watch and (self.dry_run or self.dedupe or self.recover is not None):
+            fatal("--watch can’t be combined with --dedupe, --dry-run, --resume or --rollback")
+        if self.dry_run and self.recover is not None:
+            fatal(f"--dry-run can’t be combined with --{self.recover}")
+        if self.merge is not None:
+            if self.recursive or self.watch or self.dedupe or self.recover is not None:
+                fatal("--merge can’t be combined with --dedupe, --recursive, --watch, --resume or --rollback")
+            if len(parameters) == 0:
+                fatal("No directory to merge")
+        elif len(parameters) > 1 and not self.recursive:
             fatal("Too many arguments")
+        if len(parameters) == 0:
+            parameters = ["."]
 
-        directory = "."
-        if len(parameters) > 0:
-            directory = parameters[0]
-
-        self.directory = Path(directory)
-        if not self.directory.exists():
-            fatal(f"No such directory: {directory}")
-        if not self.directory.is_dir():
-            fatal(f"Not a directory: {directory}")
+        self.directories = [Path(directory) for directory in parameters]
+        for directory in parameters:
+            if not Path(directory).exists():
+                fatal(f"No such directory: {directory}")
+            if not Path(directory).is_dir():
+                fatal(f"Not a directory: {directory}")
+        self.directory = self.directories[0]
+        if self.merge is not None and self.merge.exists():
+            if not self.merge.is_dir():
+                fatal(f"Not a directory: {self.merge}")
+            if any(self.merge.samefile(directory) for directory in self.directories):
+                fatal(f"Can’t merge into one of the merged directories: {self.merge}")
@@ -0,0 +1,117 @@
+import datetime
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+cache_version = 1
+"""
+Version of the dates found in files, stored as the user_version of the cache
+database. Entries cached by another version are dropped, so it must be
+increased whenever a change to date extraction can give a file another date,
+or a date where there was none, e.g. reading MP4 and MOV videos.
+"""
+
+def default_cache_path() -> Path:
+    """
+    :return: the cache file location, according to the XDG Base Directory
+      specification.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pisort" / "dates.sqlite3"
+
+
+class DateCache:
+    """
+    Persistent cache of the dates of files, keyed on their path. An entry is
+    only valid as long as the file keeps the same inode, size and
+    modification time.
+
+    Entries written by another `cache_version` are dropped when the cache is
+    opened. A cache may be shared between threads.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if version != cache_version:
+            self.connection.execute("DROP TABLE IF EXISTS dates")
+            self.connection.execute(f"PRAGMA user_version = {cache_version}")
+        self.connection.execute("""\
+            CREATE TABLE IF NOT EXISTS dates (
+                path TEXT PRIMARY KEY,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                date TEXT
+            )""")
+
+    def __enter__(self) -> "DateCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get(self, path: Path, stat: os.stat_result) -> Optional[datetime.datetime]:
+        """
+        :return: the cached date of the file, None if the file is known to
+          have no date.
+        :raise KeyError: the file isn’t in the cache, or has changed since it
+          was cached.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT inode, size, mtime_ns, date FROM dates WHERE path = ?",
+                (str(path.absolute()),),
+            ).fetchone()
+        if row is None or row[:3] != (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+            raise KeyError(path)
+        return None if row[3] is None else datetime.datetime.fromisoformat(row[3])
+
+    def put(
+            self,
+            path: Path,
+            stat: os.stat_result,
+            date: Optional[datetime.datetime],
+    ) -> None:
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO dates VALUES (?, ?, ?, ?, ?)",
+                (
+                    str(path.absolute()),
+                    stat.st_ino,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    None if date is None else date.isoformat(),
+                ),
+            )
+
+    def moved(self, renames: list[tuple[Path, Path]]) -> None:
+        """
+        Update entries of renamed files. Renaming doesn’t change the inode,
+        size nor modification time of a file, so their entries stay valid.
+        """
+        old_paths = [(str(old.absolute()),) for old, _ in renames]
+        rows = []
+        with self.lock:
+            for (old, new) in renames:
+                row = self.connection.execute(
+                    "SELECT inode, size, mtime_ns, date FROM dates WHERE path = ?",
+                    (str(old.absolute()),),
+                ).fetchone()
+                if row is not None:
+                    rows.append((str(new.absolute()), *row))
+            self.connection.executemany("DELETE FROM dates WHERE path = ?", old_paths)
+            self.connection.executemany("INSERT OR REPLACE INTO dates VALUES (?, ?, ?, ?, ?)", rows)
+
+    def commit(self) -> None:
+        with self.lock:
+            self.connection.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
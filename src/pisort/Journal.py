@@ -0,0 +1,133 @@
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from pisort.exceptions import CorruptJournalException
+
+journal_name = ".pisort-journal"
+
+
+class Rename(NamedTuple):
+    source: str
+    target: str
+    inode: int
+    """Inode of the renamed file."""
+
+
+def snapshot(directory: Path) -> dict[str, int]:
+    """
+    :return: the inode of every entry of the directory, from a single listing.
+    """
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.inode() for entry in entries}
+
+
+def fsync_directory(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Write-ahead log of the renames planned in a directory.
+
+    Renames are grouped in sequences, that must each be performed in order,
+    but are independent of each other. The journal is written and synced
+    once, before the first rename, and removed once every rename is done. If
+    the process is interrupted in between, the journal allows finding how far
+    each sequence went, and either completing or undoing it.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.path = directory / journal_name
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def write(self, sequences: list[list[Rename]]) -> None:
+        temp = self.path.with_name(journal_name + ".tmp")
+        with temp.open("w") as f:
+            for sequence in sequences:
+                f.write(json.dumps(sequence))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        temp.rename(self.path)
+        fsync_directory(self.directory)
+
+    def read(self) -> list[list[Rename]]:
+        with self.path.open() as f:
+            return [[Rename(*rename) for rename in json.loads(line)] for line in f]
+
+    def remove(self) -> None:
+        fsync_directory(self.directory)
+        self.path.unlink()
+
+    def run(self, sequences: list[list[Rename]]) -> None:
+        """
+        Journal the given renames, then perform them.
+        """
+        self.write(sequences)
+        for sequence in sequences:
+            self.rename(sequence)
+        self.remove()
+
+    def resume(self) -> None:
+        """
+        Complete the renames of an interrupted run.
+        """
+        sequences = self.read()
+        inodes = snapshot(self.directory)
+        for sequence in sequences:
+            self.rename(sequence[progress(sequence, inodes):])
+        self.remove()
+
+    def rollback(self) -> None:
+        """
+        Undo the renames of an interrupted run.
+        """
+        sequences = self.read()
+        inodes = snapshot(self.directory)
+        for sequence in sequences:
+            done = sequence[:progress(sequence, inodes)]
+            self.rename([Rename(r.target, r.source, r.inode) for r in reversed(done)])
+        self.remove()
+
+    def rename(self, renames: list[Rename]) -> None:
+        for rename in renames:
+            os.rename(self.directory / rename.source, self.directory / rename.target)
+
+
+def progress(sequence: list[Rename], inodes: dict[str, int]) -> int:
+    """
+    :param inodes: the current inode of every file of the directory.
+    :return: the number of renames of the sequence that were performed.
+    """
+    # Replay the sequence, starting from the files it initially found, and
+    # keep the last step matching the directory. Files are identified by
+    # inode, which tells apart the start and the end of a cycle of renames.
+    state: dict[str, Optional[int]] = {}
+    for rename in sequence:
+        state.setdefault(rename.source, rename.inode)
+        state.setdefault(rename.target, None)
+
+    def matches(name: str) -> bool:
+        return state[name] == inodes.get(name)
+
+    mismatches = sum(1 for name in state if not matches(name))
+    result = 0 if mismatches == 0 else None
+    for i, rename in enumerate(sequence):
+        mismatches -= sum(1 for name in (rename.source, rename.target) if not matches(name))
+        state[rename.source] = None
+        state[rename.target] = rename.inode
+        mismatches += sum(1 for name in (rename.source, rename.target) if not matches(name))
+        if mismatches == 0:
+            result = i + 1
+    if result is None:
+        raise CorruptJournalException()
+    return result
@@ -1,49 +1,216 @@
 import datetime
+import io
+import mmap
 from pathlib import Path
-from typing import Optional, TextIO
-
-import exifread
-from exifread.core.ifd_tag import IfdTag
+from typing import BinaryIO, Optional, TextIO, TYPE_CHECKING
 
+from pisort.Stats import Stats, no_stats
 from pisort.exceptions import NoExifDataException
-from pisort.parse_offset import parse_offset
+from pisort.exif_tags import TagLocation, locate_dates, read_value
+from pisort.isobmff import is_isobmff, read_creation_time, read_exif_item
+from pisort.parse_datetime import parse_exif_datetime
+from pisort.parse_offset import current_timezone, parse_offset
+
+if TYPE_CHECKING:
+    from exifread.core.ifd_tag import IfdTag
+
+date_tags = [
+    ("EXIF DateTimeOriginal", "EXIF OffsetTimeOriginal"),
+    ("EXIF DateTimeDigitized", "EXIF OffsetTimeDigitized"),
+    ("Image DateTime", "EXIF OffsetTime"),
+]
 
-exif_datetime_format = "%Y:%m:%d %H:%M:%S"
+# Exif IFD entries are sorted by tag number, and OffsetTimeDigitized (0x9012)
+# comes after every other tag from date_tags. Once it is read, nothing else
+# is needed.
+last_date_tag = "OffsetTimeDigitized"
+# Size of the beginning of files where the date tags are looked for, before
+# falling back to exifread, when files can’t be memory-mapped. JPEG Exif
+# segments are at most 64 KiB.
+head_size = 64 * 1024
 
 
 class Picture:
+    __slots__ = ("path", "exif", "_date")
 
-    def __init__(self, path: Path):
+    def __init__(
+            self,
+            path: Path,
+            details: bool = False,
+            keep_exif: bool = False,
+            stats: Stats = no_stats,
+    ):
+        """
+        :param details: parse all the Exif metadata, including MakerNote and
+          thumbnail. By default, only the tags needed to compute the date are
+          guaranteed to be read.
+        :param keep_exif: keep the Exif tags in the `exif` attribute. By
+          default, only the date is kept and `exif` is None. MP4 and MOV
+          videos, dated by the creation time of their container, have no
+          Exif tags.
+        """
         self.path = path
-        with path.open("rb") as f:
-            self.exif: dict[str, IfdTag] = exifread.process_file(f)
-        if len(self.exif) == 0:
-            raise NoExifDataException()
+        values = None
+        exif = None
+        with stats.open(path) as f, stats.phase("exif"):
+            if is_isobmff(f):
+                tiff, video_date = read_container(f)
+                if video_date is not None:
+                    self.exif = {} if keep_exif else None
+                    self._date = video_date
+                    return
+                # Read the Exif item of HEIC pictures as a TIFF file
+                f = io.BytesIO(tiff)
+            if not details and not keep_exif:
+                values = read_raw_dates(f, stats)
+            if values is None:
+                f.seek(0)
+                exif = read_exif(f, details)
+        if exif is not None:
+            if len(exif) == 0:
+                raise NoExifDataException()
+            values = {tag: exif[tag].values for tags in date_tags for tag in tags if tag in exif}
+        self.exif: Optional[dict[str, "IfdTag"]] = exif if keep_exif else None
+        with stats.phase("date"):
+            self._date = exif_date(values)
+
+    @classmethod
+    def with_date(cls, path: Path, date: Optional[datetime.datetime]) -> "Picture":
+        """
+        Create a picture whose date is already known, for instance from a
+        cache, without reading the file.
+        """
+        picture = cls.__new__(cls)
+        picture.path = path
+        picture.exif = None
+        picture._date = date
+        return picture
 
     def __str__(self) -> str:
         return self.path.name
 
     def print(self, file: Optional[TextIO] = None) -> None:
-        print(f'{self.path.name}:')
+        if self.exif is None:
+            raise ValueError("Exif tags were not kept")
+        print(f'{self.path.name}:', file=file)
         for k, v in self.exif.items():
             print(f'  {k}: {v}', file=file)
 
     def date(self) -> Optional[datetime.datetime]:
-        tz = datetime.datetime.now().astimezone().tzinfo
-        for (date_tag, tz_tag) in [
-            ("EXIF DateTimeOriginal", "EXIF OffsetTimeOriginal"),
-            ("EXIF DateTimeDigitized", "EXIF OffsetTimeDigitized"),
-            ("Image DateTime", "EXIF OffsetTime"),
-        ]:
-            if date_tag in self.exif.keys():
-                date = datetime.datetime.strptime(
-                    self.exif[date_tag].values,
-                    exif_datetime_format,
-                )
-                if tz_tag in self.exif.keys():
-                    tz = parse_offset(self.exif[tz_tag].values)
-                return date.replace(tzinfo=tz)
-        return None
+        return self._date
 
     def rename_to(self, new_stem: str) -> None:
         self.path = self.path.rename(self.path.with_stem(new_stem))
+
+
+def read_raw_dates(f: BinaryIO, stats: Stats = no_stats) -> Optional[dict[str, str]]:
+    """
+    Read the date tags with the minimal reader of exif_tags, through a memory
+    map of the file, or from its first `head_size` bytes where the file can’t
+    be mapped, such as pipes and some FUSE filesystems.
+
+    Reads through the map bypass `f`, so the pages holding the beginning of
+    the file, the TIFF header and the date values are counted as bytes read
+    in `stats` instead.
+
+    :return: the values of the date tags, or None if they must be read by
+      exifread instead.
+    """
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Also raised for empty files, which are read as usual
+        mapped = None
+    try:
+        with memoryview(f.read(head_size) if mapped is None else mapped) as data:
+            located = None
+            try:
+                located = locate_dates(data)
+            finally:
+                if mapped is not None:
+                    stats.count("bytes read", mapped_size(located, len(mapped)))
+            if located is None:
+                return None
+            return {name: read_value(data, location) for name, location in located[1].items()}
+    except (EOFError, ValueError):
+        # Unusual layout, left to exifread
+        return None
+    finally:
+        if mapped is not None:
+            mapped.close()
+
+
+def mapped_size(located: Optional[tuple[int, dict[str, TagLocation]]], size: int) -> int:
+    """
+    :param located: the TIFF header offset and date tag locations of a file,
+      if found.
+    :param size: size of the file.
+    :return: the size of the pages of the file read through a memory map to
+      locate its date tags.
+    """
+    pages = {0}
+    if located is not None:
+        tiff, locations = located
+        pages.add(tiff // mmap.PAGESIZE)
+        for location in locations.values():
+            pages.update(range(
+                location.offset // mmap.PAGESIZE,
+                (location.offset + location.count - 1) // mmap.PAGESIZE + 1,
+            ))
+    return min(len(pages) * mmap.PAGESIZE, size)
+
+
+def read_container(f: BinaryIO) -> tuple[Optional[bytes], Optional[datetime.datetime]]:
+    """
+    Read the metadata of an ISO-BMFF file: the Exif item of HEIC pictures, or
+    else the creation time of MP4 and MOV videos.
+
+    :return: either the TIFF structure of the Exif item, or the creation
+      time.
+    :raise NoExifDataException: the file has neither, or is corrupt.
+    """
+    try:
+        tiff = read_exif_item(f)
+        if tiff is not None:
+            return tiff, None
+        date = read_creation_time(f)
+    except (EOFError, ValueError) as e:
+        raise NoExifDataException() from e
+    if date is None:
+        raise NoExifDataException()
+    return None, date
+
+
+def read_exif(f: BinaryIO, details: bool = False) -> dict[str, "IfdTag"]:
+    """
+    Parse Exif metadata with exifread.
+
+    :param details: parse all the Exif metadata, including MakerNote and
+      thumbnail, instead of stopping after the date tags.
+    """
+    # exifread is slow to import, and not needed to parse command lines
+    import exifread
+
+    if details:
+        return exifread.process_file(f)
+    return exifread.process_file(
+        f,
+        stop_tag=last_date_tag,
+        details=False,
+        extract_thumbnail=False,
+    )
+
+
+def exif_date(values: dict[str, str]) -> Optional[datetime.datetime]:
+    """
+    :param values: values of the tags from date_tags.
+    """
+    for (date_tag, tz_tag) in date_tags:
+        if date_tag in values:
+            date = parse_exif_datetime(values[date_tag])
+            if tz_tag in values:
+                tz = parse_offset(values[tz_tag])
+            else:
+                tz = current_timezone()
+            return date.replace(tzinfo=tz)
+    return None
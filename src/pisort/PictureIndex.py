@@ -0,0 +1,114 @@
+import bisect
+import datetime
+from typing import Iterable, Iterator, Optional, overload
+
+from pisort.Picture import Picture
+
+max_date = datetime.datetime(
+    datetime.MAXYEAR, 12, 31,
+    tzinfo=datetime.timezone.utc,
+)
+
+
+def sort_key(picture: Picture) -> tuple[datetime.datetime, str]:
+    """
+    :return: the key of pictures in chronological order. Pictures with no date
+      come last, and pictures with the same date are ordered by name.
+    """
+    return picture.date() or max_date, picture.path.name
+
+
+class PictureIndex:
+    """
+    Pictures of a folder, in chronological order, with O(log n) lookup of the
+    position of a picture.
+
+    Every insertion or removal creates a new version of the index, and
+    changed_since() tells the lowest position shifted since a version, so that
+    only pictures from there on need renumbering.
+    """
+
+    def __init__(self, pictures: Iterable[Picture] = ()):
+        """
+        :param pictures: pictures to load, in any order, sorted at once.
+        """
+        self._pictures = sorted(pictures, key=sort_key)
+        self._keys = [sort_key(picture) for picture in self._pictures]
+        self.version = 0
+        self._changes: list[tuple[int, int]] = []
+        """Version, and lowest shifted position, of every change."""
+
+    def __len__(self) -> int:
+        return len(self._pictures)
+
+    def __iter__(self) -> Iterator[Picture]:
+        return iter(self._pictures)
+
+    @overload
+    def __getitem__(self, position: int) -> Picture: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> list[Picture]: ...
+
+    def __getitem__(self, position):
+        return self._pictures[position]
+
+    def index(self, picture: Picture) -> int:
+        """
+        :return: the position of the picture.
+        :raise ValueError: the picture is not in the index.
+        """
+        position = bisect.bisect_left(self._keys, sort_key(picture))
+        if position == len(self._keys) or self._pictures[position] is not picture:
+            raise ValueError(f"{picture.path} is not in the index")
+        return position
+
+    def insert(self, picture: Picture) -> int:
+        """
+        :return: the position of the picture.
+        """
+        key = sort_key(picture)
+        position = bisect.bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._pictures.insert(position, picture)
+        self._changed(position)
+        return position
+
+    def remove(self, picture: Picture) -> int:
+        """
+        :return: the position the picture had.
+        :raise ValueError: the picture is not in the index.
+        """
+        position = self.index(picture)
+        del self._keys[position]
+        del self._pictures[position]
+        self._changed(position)
+        return position
+
+    def refresh(self, start: int = 0) -> None:
+        """
+        Update the index after pictures from `start` on were renamed, without
+        changing their order, e.g. after their new paths were planned from
+        it.
+        """
+        for position in range(start, len(self._pictures)):
+            self._keys[position] = sort_key(self._pictures[position])
+
+    def changed_since(self, version: int) -> Optional[int]:
+        """
+        :return: the lowest position whose picture may have changed since the
+          given version, or None if the index didn’t change.
+        """
+        first = bisect.bisect_right(self._changes, version, key=lambda change: change[0])
+        return min((position for _, position in self._changes[first:]), default=None)
+
+    def forget(self, version: int) -> None:
+        """
+        Drop the record of changes up to the given version, which won’t be
+        passed to changed_since() anymore.
+        """
+        del self._changes[:bisect.bisect_right(self._changes, version, key=lambda change: change[0])]
+
+    def _changed(self, position: int) -> None:
+        self.version += 1
+        self._changes.append((self.version, position))
@@ -0,0 +1,146 @@
+import heapq
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import BinaryIO, ContextManager, Iterable, Iterator, Optional, TextIO, TypeVar
+
+T = TypeVar("T")
+
+
+class CountingReader:
+    """
+    Binary file wrapper counting the bytes read through it.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def __getattr__(self, name: str):
+        return getattr(self.f, name)
+
+
+class Stats:
+    """
+    Timings and counters of a sort.
+
+    Phase durations are summed over every thread, so phases run concurrently
+    with --jobs may add up to more than the wall time.
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.phases: Counter[str] = Counter()
+        self.counters: Counter[str] = Counter()
+        self.slowest_count = slowest
+        self.slowest: list[tuple[float, str]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.phases[name] += elapsed
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        Iterate over `iterable`, adding the time spent getting each item to
+        the given phase.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += n
+
+    @contextmanager
+    def open(self, path: Path) -> Iterator[BinaryIO]:
+        """
+        Open a file for reading, and record how many bytes were read from it
+        and how long it was open.
+        """
+        start = time.perf_counter()
+        with path.open("rb") as f:
+            reader = CountingReader(f)
+            try:
+                yield reader
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    self.counters["bytes read"] += reader.bytes_read
+                    entry = (elapsed, str(path))
+                    if len(self.slowest) < self.slowest_count:
+                        heapq.heappush(self.slowest, entry)
+                    else:
+                        heapq.heappushpop(self.slowest, entry)
+
+    def report(self) -> dict:
+        with self.lock:
+            return {
+                "wall": time.perf_counter() - self.start,
+                "phases": dict(self.phases),
+                "counters": dict(self.counters),
+                "slowest": [
+                    {"path": path, "seconds": seconds}
+                    for seconds, path in sorted(self.slowest, reverse=True)
+                ],
+            }
+
+    def print(self, file: Optional[TextIO] = None) -> None:
+        report = self.report()
+        print(f"Wall time: {report['wall']:.3f} s", file=file)
+        for name, seconds in report["phases"].items():
+            print(f"  {name}: {seconds:.3f} s", file=file)
+        for name, value in report["counters"].items():
+            print(f"{name}: {value}", file=file)
+        if len(report["slowest"]) > 0:
+            print("Slowest files:", file=file)
+            for entry in report["slowest"]:
+                print(f"  {entry['seconds'] * 1000:.1f} ms: {entry['path']}", file=file)
+
+    def write(self, path: Path) -> None:
+        with path.open("w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+class NullStats(Stats):
+    """
+    Stats that record nothing, for when they are disabled.
+    """
+
+    def __init__(self):
+        super().__init__(0)
+
+    def phase(self, name: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterable[T]:
+        return iterable
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def open(self, path: Path) -> ContextManager[BinaryIO]:
+        return path.open("rb")
+
+
+no_stats = NullStats()
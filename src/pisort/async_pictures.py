@@ -0,0 +1,133 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional, TypeVar
+
+from pisort.DateCache import DateCache
+from pisort.Picture import Picture
+from pisort.Stats import Stats, no_stats
+from pisort.list_pictures import load_cached_picture
+from pisort.sort_pictures import SortResult, plan_sort, prepare_renames, record_renames
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def async_list_pictures(
+        directory: Path,
+        jobs: int = 8,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> list[Picture]:
+    """
+    List files with an Exif date in the given directory, like list_pictures(),
+    without blocking the event loop.
+
+    Up to `jobs` files are opened and read at once, each in a thread, which
+    hides the latency of network and FUSE filesystems, and no more than
+    `4 * jobs` are queued, like iter_pictures(). Pictures are returned in the
+    same order as list_pictures().
+
+    :param cache: if set, dates are read from this cache when possible, and
+      newly read dates are added to it.
+    """
+    loop = asyncio.get_running_loop()
+
+    def read(name: str) -> Optional[Picture]:
+        path = directory / name
+        return load_cached_picture(path, path.stat() if cache is not None else None, cache, stats)
+
+    executor = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        names = await loop.run_in_executor(executor, list_files, directory, stats)
+        pictures = await map_bounded(executor, read, names, 4 * jobs)
+        if cache is not None:
+            await loop.run_in_executor(executor, cache.commit)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [picture for picture in pictures if picture is not None]
+
+
+async def async_sort_pictures(
+        pictures: Iterable[Picture],
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+        jobs: int = 8,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> SortResult:
+    """
+    Rename pictures after their chronological order, like sort_pictures(),
+    without blocking the event loop.
+
+    Renames are planned, checked for conflicts and journaled the same way.
+    Sequences of renames that don’t depend on each other then run up to
+    `jobs` at a time.
+
+    :raise PendingJournalException: a previous sort of the directory was
+      interrupted.
+    """
+    pictures = list(pictures)
+    with stats.phase("plan"):
+        plan = plan_sort(pictures, name, keep_good_names)
+    if len(plan) == 0:
+        return SortResult(0, 0)
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        journal, sequences = await loop.run_in_executor(executor, prepare_renames, plan, stats)
+        with stats.phase("rename"):
+            if len(sequences) > 0:
+                await loop.run_in_executor(executor, journal.write, sequences)
+                await map_bounded(executor, journal.rename, sequences, jobs)
+                await loop.run_in_executor(executor, journal.remove)
+        return await loop.run_in_executor(executor, record_renames, plan, sequences, cache, stats)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def map_bounded(
+        executor: ThreadPoolExecutor,
+        function: Callable[[T], R],
+        items: Iterable[T],
+        window: int,
+) -> list[R]:
+    """
+    Call the function on each item in the executor, with at most `window`
+    calls queued or running at once.
+
+    If a call fails, or the task is cancelled, the calls not started yet are
+    cancelled, and the running ones are awaited, so that none is left
+    running, without blocking the event loop.
+
+    :return: the results, in the order of `items`.
+    """
+    pending: deque[Future[R]] = deque()
+    results = []
+    try:
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= window:
+                results.append(await asyncio.wrap_future(pending[0]))
+                pending.popleft()
+        while len(pending) > 0:
+            results.append(await asyncio.wrap_future(pending[0]))
+            pending.popleft()
+    except BaseException:
+        running = [future for future in pending if not future.cancel() and not future.done()]
+        await asyncio.gather(*(asyncio.wrap_future(future) for future in running), return_exceptions=True)
+        raise
+    return results
+
+
+def list_files(directory: Path, stats: Stats = no_stats) -> list[str]:
+    """
+    :return: the names of the files of the directory, in directory order.
+    """
+    with os.scandir(directory) as entries:
+        names = [entry.name for entry in stats.timed("list", entries) if entry.is_file()]
+    stats.count("scanned", len(names))
+    return names
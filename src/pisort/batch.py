@@ -0,0 +1,67 @@
+"""
+Helpers of the command line tools processing a batch of files.
+"""
+import io
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_ordered(function: Callable[[T], R], items: Iterable[T], jobs: int = 1) -> Iterator[R]:
+    """
+    Apply `function` to items, up to `jobs` at a time. Results are yielded in
+    the order of `items`, which is consumed lazily, so that only a few items
+    are in flight at once.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield function(item)
+        return
+    # concurrent.futures is imported on first use, not to slow down --help
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending: deque["Future[R]"] = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) > 4 * jobs:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
+
+def read_paths(file: io.TextIOBase) -> Iterator[Path]:
+    for line in file:
+        line = line.rstrip("\n")
+        if line != "":
+            yield Path(line)
+
+
+def input_paths(parameters: list[str], files_from: Optional[str] = None) -> Iterator[Path]:
+    """
+    Yield the paths given on the command line, then those listed in the file
+    given with --files-from, or on the standard input if it is "-".
+    """
+    for parameter in parameters:
+        yield Path(parameter)
+    if files_from == "-":
+        yield from read_paths(sys.stdin)
+    elif files_from is not None:
+        with open(files_from) as file:
+            yield from read_paths(file)
+
+
+def parse_jobs(program: str, value: str) -> int:
+    """
+    :return: the number of jobs given with --jobs. Exit if it is invalid.
+    """
+    if not (value.isascii() and value.isdigit()) or int(value) < 1:
+        print(f"{program}: Invalid number of jobs: {value}", file=sys.stderr)
+        exit(1)
+    return int(value)
@@ -1,11 +1,141 @@
+import fnmatch
+import getopt
+import json
+import os
 import sys
 from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
-from pisort.Picture import Picture
+from pisort.Picture import read_exif
+from pisort.batch import input_paths, map_ordered, parse_jobs
+from pisort.exceptions import NoExifDataException
 
-if __name__ == "__main__":
-    for arg in sys.argv[1:]:
+
+def extract(path: Path, patterns: Optional[list[str]] = None) -> dict[str, str]:
+    """
+    :param patterns: if set, only tags whose name matches one of these shell
+      patterns are returned.
+    :return: the printable value of every Exif tag of the file, by name.
+    :raise NoExifDataException: the file has no Exif tags.
+    """
+    # Tags are dumped as they are, without computing the date, which fails
+    # on malformed date tags
+    with path.open("rb") as f:
+        exif = read_exif(f, details=True)
+    if len(exif) == 0:
+        raise NoExifDataException()
+    return {
+        name: str(tag)
+        for name, tag in exif.items()
+        if patterns is None or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+    }
+
+
+def extract_all(
+        paths: Iterable[Path],
+        patterns: Optional[list[str]] = None,
+        jobs: int = 1,
+) -> Iterator[tuple[Path, dict[str, str] | Exception]]:
+    """
+    Extract the tags of files, up to `jobs` at a time. Results are yielded in
+    the order of `paths`, which is consumed lazily, so that only a few files
+    are held in memory at once.
+
+    :return: each path, with its tags or the error raised reading them.
+    """
+    def safe_extract(path: Path) -> tuple[Path, dict[str, str] | Exception]:
         try:
-            Picture(Path(arg)).print()
+            return path, extract(path, patterns)
         except Exception as e:
-            print(f'{arg}: {e}', file=sys.stderr)
+            return path, e
+
+    return map_ordered(safe_extract, paths, jobs)
+
+
+def walk(paths: Iterable[Path]) -> Iterator[Path]:
+    """
+    Yield the given files, and the files below the given directories, in
+    name order.
+    """
+    for path in paths:
+        if not path.is_dir():
+            yield path
+            continue
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                yield Path(directory) / name
+
+
+if __name__ == "__main__":
+    options, parameters = getopt.getopt(sys.argv[1:], "hj:rt:T:", [
+        "files-from=",
+        "help",
+        "jobs=",
+        "json",
+        "recursive",
+        "tag=",
+    ])
+
+    jobs = 1
+    as_json = False
+    recursive = False
+    patterns = None
+    files_from = None
+    for k, v in options:
+        match k:
+            case "-j" | "--jobs":
+                jobs = parse_jobs(sys.argv[0], v)
+            case "--json":
+                as_json = True
+            case "-r" | "--recursive":
+                recursive = True
+            case "-t" | "--tag":
+                patterns = (patterns or []) + [v]
+            case "-T" | "--files-from":
+                files_from = v
+            case "-h" | "--help":
+                print(f"""
+usage: {sys.argv[0]} [options] paths...
+
+Print the Exif tags of the files specified in `paths...`.
+
+Options:
+ -h,--help              Display this help message and exit.
+ -j,--jobs <n>          Read up to <n> files concurrently (default: 1).
+ --json                 Print one JSON object per line and per file, with the
+                        "path" of the file, and either its "tags", or the
+                        "error" that prevented reading them.
+ -r,--recursive         Print the tags of the files below directories of
+                        `paths...`.
+ -t,--tag <pattern>     Only print tags whose name, such as
+                        "EXIF DateTimeOriginal", matches the shell pattern.
+                        Can be repeated.
+ -T,--files-from <file> Also read the files listed in <file>, one per line.
+                        Use - to read the list from the standard input.
+""")
+                exit(0)
+
+    paths: Iterable[Path] = input_paths(parameters, files_from)
+    if recursive:
+        paths = walk(paths)
+
+    failures = 0
+    for path, tags in extract_all(paths, patterns, jobs):
+        if isinstance(tags, Exception):
+            failures += 1
+        if as_json:
+            record = {"path": str(path)}
+            if isinstance(tags, Exception):
+                record["error"] = str(tags) or type(tags).__name__
+            else:
+                record["tags"] = tags
+            print(json.dumps(record, ensure_ascii=False))
+        elif isinstance(tags, Exception):
+            print(f'{path}: {tags}', file=sys.stderr)
+        else:
+            print(f'{path.name}:')
+            for name, value in tags.items():
+                print(f'  {name}: {value}')
+    if failures > 0:
+        exit(1)
@@ -0,0 +1,79 @@
+import hashlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, Optional
+
+from pisort.Picture import Picture
+from pisort.PictureIndex import sort_key
+from pisort.Stats import Stats, no_stats
+
+prefix_size = 4096
+chunk_size = 1024 * 1024
+
+
+def find_duplicates(pictures: Iterable[Picture], stats: Stats = no_stats) -> list[list[Picture]]:
+    """
+    Find pictures with the same content.
+
+    Pictures are grouped by date, then by size, then by a hash of their first
+    `prefix_size` bytes, and only those still grouped are hashed whole. Most
+    files are thus never read again, and only pictures with the same date are
+    even stat.
+
+    :return: groups of identical pictures, each in the order of sort_key().
+    """
+    def split(groups: list[list[Picture]], key: Callable[[Picture], Hashable]) -> list[list[Picture]]:
+        result = []
+        for group in groups:
+            buckets = defaultdict(list)
+            for picture in group:
+                buckets[key(picture)].append(picture)
+            result.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+        return result
+
+    with stats.phase("dedupe"):
+        groups = split([list(pictures)], Picture.date)
+        groups = split(groups, lambda picture: picture.path.stat().st_size)
+        groups = split(groups, lambda picture: digest(picture.path, prefix_size, stats))
+        groups = split(groups, lambda picture: digest(picture.path, None, stats))
+    return [sorted(group, key=sort_key) for group in groups]
+
+
+def dedupe(
+        pictures: Iterable[Picture],
+        stats: Stats = no_stats,
+) -> tuple[list[Picture], list[tuple[Picture, Picture]]]:
+    """
+    Leave duplicates out of pictures, keeping the first of each group of
+    find_duplicates().
+
+    :return: the remaining pictures, in the given order, and each duplicate
+      left out with the picture it duplicates.
+    """
+    pictures = list(pictures)
+    duplicates = [
+        (duplicate, group[0])
+        for group in find_duplicates(pictures, stats)
+        for duplicate in group[1:]
+    ]
+    stats.count("duplicates", len(duplicates))
+    left_out = {duplicate for duplicate, _ in duplicates}
+    return [picture for picture in pictures if picture not in left_out], duplicates
+
+
+def digest(path: Path, size: Optional[int], stats: Stats = no_stats) -> bytes:
+    """
+    :return: the hash of the first `size` bytes of the file, or of the whole
+      file if `size` is None.
+    """
+    h = hashlib.blake2b()
+    read = 0
+    with path.open("rb") as f:
+        while size is None or read < size:
+            chunk = f.read(chunk_size if size is None else min(chunk_size, size - read))
+            if not chunk:
+                break
+            h.update(chunk)
+            read += len(chunk)
+    stats.count("bytes hashed", read)
+    return h.digest()
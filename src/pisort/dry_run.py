@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, TextIO
+
+from pisort.Picture import Picture
+from pisort.sort_pictures import find_conflicts, plan_duplicates, plan_sort
+
+
+def dry_run(
+        pictures: Iterable[Picture],
+        file: TextIO,
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+        duplicates: Iterable[tuple[Picture, Picture]] = (),
+) -> int:
+    """
+    Write the renames sort_pictures() would perform as JSON Lines, one object
+    per picture, in chronological order. Nothing is renamed.
+
+    :param duplicates: pictures left out of the sort, each with the picture it
+      duplicates, written after the renames with a "duplicate_of" member.
+
+    :return: the number of renames that would overwrite another file. These
+      have a "conflict" member set to true.
+    """
+    duplicates = list(duplicates)
+    plan = plan_sort(pictures, name, keep_good_names)
+    plan += plan_duplicates(plan, duplicates)
+    originals = {duplicate: original for duplicate, original in duplicates}
+    return write_renames(find_conflicts(plan), file, originals)
+
+
+def write_renames(
+        renames: Iterable[tuple[Picture, Path, bool]],
+        file: TextIO,
+        originals: Mapping[Picture, Picture] = {},
+) -> int:
+    """
+    Write planned renames as JSON Lines, with "source", "target" and "date"
+    members, and "conflict" set to true for renames that would overwrite
+    another file.
+
+    :param originals: the picture duplicated by each duplicate, written as a
+      "duplicate_of" member.
+    :return: the number of conflicts.
+    """
+    conflicts = 0
+    for picture, new_path, conflict in renames:
+        date = picture.date()
+        record = {
+            "source": str(picture.path),
+            "target": str(new_path),
+            "date": None if date is None else date.isoformat(),
+        }
+        if picture in originals:
+            record["duplicate_of"] = str(originals[picture].path)
+        if conflict:
+            record["conflict"] = True
+            conflicts += 1
+        file.write(json.dumps(record, ensure_ascii=False))
+        file.write("\n")
+    return conflicts
@@ -1,2 +1,33 @@
 class NoExifDataException(Exception):
     pass
+
+
+class PendingJournalException(Exception):
+    """
+    A previous sort of the directory was interrupted, and must be resumed or
+    rolled back first.
+    """
+    pass
+
+
+class CorruptJournalException(Exception):
+    """
+    The files of the directory don’t match any step of its journal.
+    """
+    pass
+
+
+class MergeException(Exception):
+    """
+    Moving files into the target of a merge failed. The files already moved
+    keep their new name, and the others stay in their folder.
+    """
+
+    def __init__(self, moved: int, error: OSError):
+        super().__init__(moved, error)
+        self.moved = moved
+        """Number of files moved before the error."""
+        self.error = error
+
+    def __str__(self) -> str:
+        return f"{self.error}, after moving {self.moved} files"
@@ -0,0 +1,155 @@
+"""
+Minimal Exif reader, locating the date tags in the raw bytes of a file.
+"""
+import struct
+from typing import NamedTuple, Optional
+
+png_signature = b"\x89PNG\r\n\x1a\n"
+tiff_signatures = (b"II*\0", b"MM\0*")
+ascii_type = 2
+exif_offset_tag = 0x8769
+ifd0_tags = {
+    0x0132: "Image DateTime",
+}
+exif_ifd_tags = {
+    0x9003: "EXIF DateTimeOriginal",
+    0x9004: "EXIF DateTimeDigitized",
+    0x9010: "EXIF OffsetTime",
+    0x9011: "EXIF OffsetTimeOriginal",
+    0x9012: "EXIF OffsetTimeDigitized",
+}
+
+
+class TagLocation(NamedTuple):
+    offset: int
+    """Offset of the value from the start of the buffer."""
+    count: int
+    """Length of the value, including its NULL terminator."""
+
+
+def unpack(fmt: str, data, offset: int) -> tuple:
+    if offset < 0 or offset + struct.calcsize(fmt) > len(data):
+        raise EOFError(f"Offset {offset} out of buffer")
+    return struct.unpack_from(fmt, data, offset)
+
+
+def find_tiff_header(data) -> Optional[int]:
+    """
+    :param data: the beginning of a JPEG or TIFF file.
+    :return: the offset of the TIFF header holding the Exif metadata, or None
+      if the format isn’t recognized or has no Exif metadata.
+    """
+    if data[:4] in tiff_signatures:
+        return 0
+    if data[:2] != b"\xff\xd8":
+        return None
+    offset = 2
+    while True:
+        marker, length = unpack(">HH", data, offset)
+        if marker == 0xffe1 and data[offset + 4:offset + 10] == b"Exif\0\0":
+            return offset + 10
+        if marker == 0xffda or marker & 0xff00 != 0xff00:
+            # Start of scan, or corrupt segment: no Exif metadata before image
+            # data.
+            return None
+        offset += 2 + length
+
+
+def find_png_exif(data) -> Optional[int]:
+    """
+    :param data: the beginning of a PNG file.
+    :return: the offset of the TIFF header of the eXIf chunk, or None if there
+      is none.
+    :raise EOFError: the eXIf chunk is beyond the buffer.
+    """
+    offset = len(png_signature)
+    while True:
+        length, kind = unpack(">I4s", data, offset)
+        if kind == b"eXIf":
+            tiff = offset + 8
+            return tiff if data[tiff:tiff + 4] in tiff_signatures else None
+        if kind == b"IEND":
+            return None
+        offset += 12 + length
+
+
+def locate_tags(data, tiff: int) -> dict[str, TagLocation]:
+    """
+    Locate the ASCII date tags of the IFD0 and Exif IFD.
+
+    :param data: buffer holding the TIFF structure.
+    :param tiff: offset of the TIFF header in `data`.
+    :return: tag locations, by tag name as formatted by exifread.
+    :raise EOFError: the TIFF structure goes beyond the buffer.
+    """
+    endian = "<" if data[tiff:tiff + 2] == b"II" else ">"
+    result = {}
+
+    def read_ifd(ifd: int, names: dict[int, str]) -> Optional[int]:
+        exif_ifd = None
+        (count,) = unpack(endian + "H", data, tiff + ifd)
+        for i in range(count):
+            entry = tiff + ifd + 2 + 12 * i
+            tag, type_, length, value = unpack(endian + "HHII", data, entry)
+            if tag == exif_offset_tag:
+                exif_ifd = value
+            elif tag in names and type_ == ascii_type:
+                offset = entry + 8 if length <= 4 else tiff + value
+                if offset + length > len(data):
+                    raise EOFError(f"Offset {offset} out of buffer")
+                result[names[tag]] = TagLocation(offset, length)
+        return exif_ifd
+
+    (ifd0,) = unpack(endian + "I", data, tiff + 4)
+    exif_ifd = read_ifd(ifd0, ifd0_tags)
+    if exif_ifd is not None:
+        read_ifd(exif_ifd, exif_ifd_tags)
+    return result
+
+
+def read_value(data, location: TagLocation) -> str:
+    """
+    Read an ASCII tag value up to its NULL terminator, decoded as UTF-8 like
+    exifread does.
+
+    :raise UnicodeDecodeError: the value isn’t valid UTF-8, which exifread
+      leaves undecoded.
+    """
+    value = bytes(data[location.offset:location.offset + location.count])
+    return value.split(b"\0", 1)[0].decode()
+
+
+def locate_dates(data) -> Optional[tuple[int, dict[str, TagLocation]]]:
+    """
+    Locate the date tags of a JPEG, TIFF or PNG file.
+
+    :param data: the beginning of the file.
+    :return: the offset of the TIFF header, and the location of each date tag
+      found, or None if the format isn’t recognized or the file has no Exif
+      metadata.
+    :raise EOFError: the metadata goes beyond the buffer.
+    """
+    if data[:len(png_signature)] == png_signature:
+        tiff = find_png_exif(data)
+    else:
+        tiff = find_tiff_header(data)
+    if tiff is None:
+        return None
+    return tiff, locate_tags(data, tiff)
+
+
+def read_dates(data) -> Optional[dict[str, str]]:
+    """
+    Read the date tags of a JPEG, TIFF or PNG file, without exifread.
+
+    :param data: the beginning of the file.
+    :return: the value of each date tag found, by tag name as formatted by
+      exifread, or None if the format isn’t recognized or the file has no Exif
+      metadata.
+    :raise EOFError: the metadata goes beyond the buffer.
+    :raise UnicodeDecodeError: a value isn’t valid UTF-8.
+    """
+    located = locate_dates(data)
+    if located is None:
+        return None
+    return {name: read_value(data, location) for name, location in located[1].items()}
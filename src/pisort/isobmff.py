@@ -0,0 +1,230 @@
+"""
+Minimal ISO base media file format reader, finding the date of MP4 and MOV
+videos, and the Exif metadata of HEIC pictures.
+
+Boxes are found by seeking from one box header to the next, so media data is
+never read, and a video of several GiB costs a few small reads.
+"""
+import datetime
+import io
+import os
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from pisort.exif_tags import tiff_signatures, unpack
+
+# Types of the first box of ISO-BMFF files: ftyp, or for older QuickTime
+# movies, any of the others.
+first_box_types = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip"}
+# Epoch of the times of mvhd boxes, which are in UTC.
+mac_epoch = datetime.datetime(1904, 1, 1, tzinfo=datetime.timezone.utc)
+# Maximum size of the boxes and Exif items read whole. They are a few KiB,
+# anything larger is corrupt.
+max_read_size = 1024 * 1024
+
+
+class Box(NamedTuple):
+    type: bytes
+    start: int
+    """Offset of the payload, after the header."""
+    end: int
+    """Offset of the end of the box."""
+
+
+def is_isobmff(f: BinaryIO) -> bool:
+    """
+    :return: whether the file starts with an ISO-BMFF box. The file is
+      rewound.
+    """
+    header = f.read(8)
+    f.seek(0)
+    return len(header) == 8 and header[4:8] in first_box_types
+
+
+def iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Box]:
+    """
+    Yield the boxes between two offsets of the file, reading only their
+    headers.
+
+    :raise ValueError: a box has an invalid size.
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(16)
+        size, kind = unpack(">I4s", header, 0)
+        payload = offset + 8
+        if size == 1:
+            (size,) = unpack(">Q", header, 8)
+            payload += 8
+        elif size == 0:
+            # The box extends to the end of its parent
+            size = end - offset
+        if size < payload - offset or offset + size > end:
+            raise ValueError(f"Invalid size of {kind!r} box at offset {offset}")
+        yield Box(kind, payload, offset + size)
+        offset += size
+
+
+def find_box(f: BinaryIO, start: int, end: int, kind: bytes) -> Optional[Box]:
+    """
+    :return: the first box of the given type between two offsets, or None.
+    """
+    return next((box for box in iter_boxes(f, start, end) if box.type == kind), None)
+
+
+def read_box(f: BinaryIO, box: Box) -> bytes:
+    """
+    :return: the payload of the box.
+    :raise ValueError: the box is too large to be read whole.
+    """
+    if box.end - box.start > max_read_size:
+        raise ValueError(f"{box.type!r} box too large: {box.end - box.start} bytes")
+    f.seek(box.start)
+    return read_exactly(f, box.end - box.start)
+
+
+def read_exactly(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) < size:
+        raise EOFError("Unexpected end of file")
+    return data
+
+
+def read_uint(data: bytes, offset: int, size: int) -> int:
+    """
+    :param size: size of the big endian integer, in bytes, possibly 0.
+    """
+    if offset + size > len(data):
+        raise EOFError(f"Offset {offset} out of buffer")
+    return int.from_bytes(data[offset:offset + size], "big")
+
+
+def read_creation_time(f: BinaryIO) -> Optional[datetime.datetime]:
+    """
+    :return: the creation time of the movie header (mvhd) box of a video, or
+      None if there is none, or it is unset.
+    :raise EOFError: the file is truncated.
+    :raise ValueError: the file is corrupt.
+    """
+    end = f.seek(0, os.SEEK_END)
+    moov = find_box(f, 0, end, b"moov")
+    if moov is None:
+        return None
+    mvhd = find_box(f, moov.start, moov.end, b"mvhd")
+    if mvhd is None:
+        return None
+    f.seek(mvhd.start)
+    header = f.read(12)
+    (version,) = unpack(">B", header, 0)
+    (seconds,) = unpack(">Q" if version == 1 else ">I", header, 4)
+    if seconds == 0:
+        return None
+    try:
+        return mac_epoch + datetime.timedelta(seconds=seconds)
+    except OverflowError:
+        raise ValueError(f"Invalid creation time: {seconds}")
+
+
+def read_exif_item(f: BinaryIO) -> Optional[bytes]:
+    """
+    Read the Exif item of a HEIF picture, such as HEIC or AVIF, located
+    through the item information (iinf) and item location (iloc) boxes of its
+    meta box.
+
+    :return: the TIFF structure of the Exif metadata, or None if there is
+      none.
+    :raise EOFError: the file is truncated.
+    :raise ValueError: the file is corrupt.
+    """
+    end = f.seek(0, os.SEEK_END)
+    meta = find_box(f, 0, end, b"meta")
+    if meta is None:
+        return None
+    # meta is a full box: its children follow a version and flags
+    iinf = find_box(f, meta.start + 4, meta.end, b"iinf")
+    iloc = find_box(f, meta.start + 4, meta.end, b"iloc")
+    if iinf is None or iloc is None:
+        return None
+    item_id = find_exif_item(read_box(f, iinf))
+    if item_id is None:
+        return None
+    extents = find_item_extents(read_box(f, iloc), item_id)
+    if extents is None or sum(length for _, length in extents) > max_read_size:
+        return None
+    data = b""
+    for offset, length in extents:
+        f.seek(offset)
+        data += read_exactly(f, length)
+    # The item starts with the offset of the TIFF header in the rest of it,
+    # usually 6 to skip "Exif\0\0".
+    (tiff_offset,) = unpack(">I", data, 0)
+    tiff = 4 + tiff_offset
+    if data[tiff:tiff + 4] not in tiff_signatures:
+        return None
+    return data[tiff:]
+
+
+def find_exif_item(iinf: bytes) -> Optional[int]:
+    """
+    :param iinf: payload of an item information box.
+    :return: the ID of the first item of type Exif, or None.
+    """
+    (version,) = unpack(">B", iinf, 0)
+    start = 6 if version == 0 else 8
+    for infe in iter_boxes(io.BytesIO(iinf), start, len(iinf)):
+        if infe.type != b"infe":
+            continue
+        (infe_version,) = unpack(">B", iinf, infe.start)
+        if infe_version < 2:
+            # Versions 0 and 1 have no item type
+            continue
+        if infe_version == 2:
+            item_id, _, item_type = unpack(">HH4s", iinf, infe.start + 4)
+        else:
+            item_id, _, item_type = unpack(">IH4s", iinf, infe.start + 4)
+        if item_type == b"Exif":
+            return item_id
+    return None
+
+
+def find_item_extents(iloc: bytes, item_id: int) -> Optional[list[tuple[int, int]]]:
+    """
+    :param iloc: payload of an item location box.
+    :return: the file offset and length of each extent of the item, or None
+      if the item is not found, or not stored in extents of the file.
+    """
+    (version,) = unpack(">B", iloc, 0)
+    if version > 2:
+        return None
+    sizes, more_sizes = unpack(">BB", iloc, 4)
+    offset_size, length_size = sizes >> 4, sizes & 0xf
+    base_offset_size = more_sizes >> 4
+    index_size = more_sizes & 0xf if version > 0 else 0
+    id_size = 4 if version == 2 else 2
+    (count,) = unpack(">I" if version == 2 else ">H", iloc, 6)
+    position = 6 + id_size
+    for _ in range(count):
+        current_id = read_uint(iloc, position, id_size)
+        position += id_size
+        construction_method = 0
+        if version > 0:
+            construction_method = read_uint(iloc, position, 2) & 0xf
+            position += 2
+        # Data reference index, 0 for the file itself
+        data_reference = read_uint(iloc, position, 2)
+        base_offset = read_uint(iloc, position + 2, base_offset_size)
+        position += 2 + base_offset_size
+        extent_count = read_uint(iloc, position, 2)
+        position += 2
+        extents = []
+        for _ in range(extent_count):
+            position += index_size
+            extent_offset = read_uint(iloc, position, offset_size)
+            extent_length = read_uint(iloc, position + offset_size, length_size)
+            position += offset_size + length_size
+            extents.append((base_offset + extent_offset, extent_length))
+        if current_id == item_id:
+            if construction_method != 0 or data_reference != 0 or any(length == 0 for _, length in extents):
+                return None
+            return extents
+    return None
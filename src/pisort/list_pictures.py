@@ -1,18 +1,128 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Iterator, Optional
 
+from pisort.DateCache import DateCache
 from pisort.Picture import Picture
+from pisort.Stats import Stats, no_stats
 from pisort.exceptions import NoExifDataException
 
 
-def list_pictures(directory: Path) -> list[Picture]:
-    result = []
-    for file in directory.iterdir():
-        if not file.is_file():
-            continue
+def list_pictures(
+        directory: Path,
+        jobs: int = 1,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> list[Picture]:
+    """
+    List files with an Exif date in the given directory.
+
+    See iter_pictures() for the parameters.
+    """
+    return list(iter_pictures(directory, jobs=jobs, cache=cache, stats=stats))
+
+
+def iter_pictures(
+        directory: Path,
+        jobs: int = 1,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> Iterator[Picture]:
+    """
+    Yield files with an Exif date in the given directory, as the directory is
+    scanned.
+
+    :param jobs: number of files to open and parse concurrently. The result is
+      the same, in the same order, whatever its value.
+    :param cache: if set, dates are read from this cache when possible, and
+      newly read dates are added to it.
+    """
+    window = 4 * jobs
+    with ExitStack() as stack:
+        entries = stack.enter_context(os.scandir(directory))
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=jobs)) if jobs > 1 else None
+        # Files in directory order, with either their picture, or the future
+        # picture being loaded.
+        pending: deque[tuple[Path, Optional[os.stat_result], Future | Optional[Picture]]] = deque()
+
+        def resolve() -> Optional[Picture]:
+            path, stat, result = pending.popleft()
+            if isinstance(result, Future):
+                result = result.result()
+            if stat is not None:
+                with stats.phase("cache"):
+                    cache.put(path, stat, None if result is None else result.date())
+            return result
+
+        try:
+            for entry in stats.timed("list", entries):
+                if not entry.is_file():
+                    continue
+                stats.count("scanned")
+                path = directory / entry.name
+                stat = None
+                hit = False
+                if cache is not None:
+                    with stats.phase("cache"):
+                        stat = entry.stat()
+                        try:
+                            date = cache.get(path, stat)
+                            hit = True
+                        except KeyError:
+                            pass
+                if hit:
+                    stats.count("cached")
+                    pending.append((path, None, None if date is None else Picture.with_date(path, date)))
+                elif executor is None:
+                    pending.append((path, stat, load_picture(path, stats)))
+                else:
+                    pending.append((path, stat, executor.submit(load_picture, path, stats)))
+                while len(pending) > window:
+                    if (pic := resolve()) is not None:
+                        yield pic
+            while len(pending) > 0:
+                if (pic := resolve()) is not None:
+                    yield pic
+        finally:
+            if cache is not None:
+                cache.commit()
+
+
+def load_picture(file: Path, stats: Stats = no_stats) -> Optional[Picture]:
+    try:
+        pic = Picture(file, stats=stats)
+    except NoExifDataException:
+        stats.count("skipped, no Exif data")
+        return None
+    if pic.date() is None:
+        stats.count("skipped, no date")
+        return None
+    return pic
+
+
+def load_cached_picture(
+        file: Path,
+        stat: Optional[os.stat_result],
+        cache: Optional[DateCache],
+        stats: Stats = no_stats,
+) -> Optional[Picture]:
+    """
+    Like load_picture(), but read the date from the cache when the file is
+    unchanged, and add newly read dates to the cache.
+
+    :param stat: status of the file, only needed with a cache.
+    """
+    if cache is not None:
         try:
-            pic = Picture(file)
-            if pic.date() is not None:
-                result.append(pic)
-        except NoExifDataException:
+            date = cache.get(file, stat)
+            stats.count("cached")
+            return None if date is None else Picture.with_date(file, date)
+        except KeyError:
             pass
-    return result
+    pic = load_picture(file, stats)
+    if cache is not None:
+        cache.put(file, stat, None if pic is None else pic.date())
+    return pic
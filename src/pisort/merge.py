@@ -0,0 +1,239 @@
+import datetime
+import errno
+import heapq
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+from pisort.DateCache import DateCache
+from pisort.Journal import snapshot
+from pisort.Picture import Picture
+from pisort.PictureIndex import max_date
+from pisort.Stats import Stats, no_stats
+from pisort.dry_run import write_renames
+from pisort.exceptions import MergeException
+from pisort.list_pictures import load_cached_picture
+from pisort.sort_pictures import SortResult, index_width, new_stem
+
+sorted_stem_re = re.compile("(\\d+)(?: - .*)?")
+"""Stems given by new_stem(), with the index of the file in its folder."""
+
+
+class SortedFolder:
+    """
+    Files of a folder already sorted by pisort, in the order of their index.
+    Their dates are only read when needed.
+    """
+
+    def __init__(
+            self,
+            directory: Path,
+            cache: Optional[DateCache] = None,
+            stats: Stats = no_stats,
+    ):
+        self.directory = directory
+        self.cache = cache
+        self.stats = stats
+        numbered = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                if match := sorted_stem_re.fullmatch(Path(entry.name).stem):
+                    numbered.append((int(match.group(1)), entry.name))
+        numbered.sort()
+        self.paths = [directory / name for _, name in numbered]
+        self._dates: dict[int, datetime.datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def date(self, position: int) -> datetime.datetime:
+        """
+        :return: the date of the file at the given position, read on first
+          use. Files with no date have `max_date`.
+        """
+        if position not in self._dates:
+            path = self.paths[position]
+            stat = path.stat() if self.cache is not None else None
+            picture = load_cached_picture(path, stat, self.cache, self.stats)
+            self._dates[position] = max_date if picture is None else picture.date()
+        return self._dates[position]
+
+    def pictures(self) -> Iterator[Picture]:
+        """
+        Yield the files in order, with the date that was read for them, if
+        any.
+        """
+        for position, path in enumerate(self.paths):
+            date = self._dates.get(position)
+            yield Picture.with_date(path, None if date is max_date else date)
+
+    def dated_pictures(self) -> Iterator[Picture]:
+        """
+        Yield the files in order, reading the date of each one as it is
+        reached.
+        """
+        for position, path in enumerate(self.paths):
+            date = self.date(position)
+            yield Picture.with_date(path, None if date is max_date else date)
+
+
+def merge_order(folders: Iterable[SortedFolder]) -> Iterator[Picture]:
+    """
+    Yield the files of sorted folders in one chronological order, trusting
+    the order within each folder.
+
+    Only the first and last file of each folder are dated at first. Folders
+    whose range of dates doesn’t overlap with others are yielded whole,
+    without reading any other file. Overlapping folders are merged through a
+    heap, reading the date of each file only once it is the next of its
+    folder. Files with the same date keep the order of their folders.
+    """
+    folders = [folder for folder in folders if len(folder) > 0]
+    bounds = sorted(
+        ((folder.date(0), folder.date(len(folder) - 1), i) for i, folder in enumerate(folders)),
+        key=lambda bound: (bound[0], bound[2]),
+    )
+    # Groups of folders with overlapping dates, in chronological order
+    groups: list[list[int]] = []
+    group_end = None
+    for first, last, i in bounds:
+        if group_end is not None and first < group_end:
+            groups[-1].append(i)
+            group_end = max(group_end, last)
+        else:
+            groups.append([i])
+            group_end = last
+
+    for group in groups:
+        if len(group) == 1:
+            yield from folders[group[0]].pictures()
+        else:
+            yield from heapq.merge(
+                *(folders[i].dated_pictures() for i in sorted(group)),
+                key=lambda picture: picture.date() or max_date,
+            )
+
+
+def plan_merge(
+        folders: list[SortedFolder],
+        target: Path,
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+) -> Iterator[tuple[Picture, Path]]:
+    """
+    Compute the paths of the files of sorted folders in the target directory,
+    numbered in one sequence, as they are merged.
+
+    :return: files in chronological order, with their new path.
+    """
+    width = index_width(sum(len(folder) for folder in folders))
+    for index, picture in enumerate(merge_order(folders)):
+        yield picture, target / picture.path.with_stem(new_stem(picture, index, width, name, keep_good_names)).name
+
+
+def taken_indexes(folders: list[SortedFolder], target: Path) -> dict[int, Path]:
+    """
+    Find the files of the target directory numbered within the merged
+    sequence. Whatever their name, they could be overwritten by the merged
+    files, or be mistaken for one of them.
+
+    :return: these files, by index.
+    :raise ValueError: the target is one of the merged folders.
+    """
+    if target.exists() and any(os.path.samefile(folder.directory, target) for folder in folders):
+        raise ValueError(f"{target} is one of the merged folders")
+    count = sum(len(folder) for folder in folders)
+    taken = {}
+    for existing in (snapshot(target) if target.is_dir() else {}):
+        match = sorted_stem_re.fullmatch(Path(existing).stem)
+        if match and int(match.group(1)) < count:
+            taken[int(match.group(1))] = target / existing
+    return taken
+
+
+def check_target(folders: list[SortedFolder], target: Path) -> None:
+    """
+    Check that the merged files can be moved into the target directory
+    without overwriting anything, see taken_indexes().
+
+    :raise ValueError: the target is one of the merged folders.
+    :raise FileExistsError: the target already holds a numbered file.
+    """
+    taken = taken_indexes(folders, target)
+    if len(taken) > 0:
+        raise FileExistsError(errno.EEXIST, "Target file already exists", str(taken[min(taken)]))
+
+
+def dry_run_merge(
+        directories: Iterable[Path],
+        target: Path,
+        file: TextIO,
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> int:
+    """
+    Write the moves merge() would perform as JSON Lines, like dry_run().
+    Nothing is moved.
+
+    :return: the number of moves that conflict with a file of the target,
+      numbered with the same index, which makes merge() refuse to move
+      anything.
+    :raise ValueError: the target is one of the merged folders.
+    """
+    folders = [SortedFolder(directory, cache, stats) for directory in directories]
+    taken = taken_indexes(folders, target)
+    try:
+        return write_renames((
+            (picture, new_path, index in taken)
+            for index, (picture, new_path) in enumerate(plan_merge(folders, target, name, keep_good_names))
+        ), file)
+    finally:
+        if cache is not None:
+            cache.commit()
+
+
+def merge(
+        directories: Iterable[Path],
+        target: Path,
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> SortResult:
+    """
+    Move the files of folders sorted by pisort into the target directory,
+    created if needed, and number them in one chronological sequence.
+
+    Files are moved as they are merged, without a journal: if interrupted,
+    the files already moved keep their new name, and the others stay in
+    their folder.
+
+    :raise ValueError: the target is one of the merged folders.
+    :raise FileExistsError: the target already holds a numbered file.
+    :raise MergeException: creating the target, reading or moving a file
+      failed, possibly after moving others.
+    """
+    folders = [SortedFolder(directory, cache, stats) for directory in directories]
+    with stats.phase("merge"):
+        check_target(folders, target)
+    moved = []
+    try:
+        with stats.phase("merge"):
+            target.mkdir(exist_ok=True)
+            for picture, new_path in plan_merge(folders, target, name, keep_good_names):
+                os.rename(picture.path, new_path)
+                moved.append((picture.path, new_path))
+    except OSError as error:
+        raise MergeException(len(moved), error) from error
+    finally:
+        if cache is not None:
+            with stats.phase("cache"):
+                cache.moved(moved)
+                cache.commit()
+    stats.count("renamed", len(moved))
+    return SortResult(len(moved), len(moved))
@@ -0,0 +1,23 @@
+import datetime
+import re
+
+exif_datetime_format = "%Y:%m:%d %H:%M:%S"
+exif_datetime_re = re.compile("(\\d{4}):(\\d\\d):(\\d\\d) (\\d\\d):(\\d\\d):(\\d\\d)", re.ASCII)
+
+
+def parse_exif_datetime(string: str) -> datetime.datetime:
+    """
+    Parse an Exif date, like `datetime.strptime(string, exif_datetime_format)`
+    but about three times faster, matching the fixed 19 characters layout
+    Exif specifies instead of interpreting the format for every date.
+
+    Dates that don’t follow the layout exactly are handed to strptime, which
+    is more lenient, e.g. with single digit fields.
+
+    :raise ValueError: the string is not a valid date.
+    """
+    match = exif_datetime_re.fullmatch(string)
+    if not match:
+        return datetime.datetime.strptime(string, exif_datetime_format)
+    year, month, day, hour, minute, second = match.groups()
+    return datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
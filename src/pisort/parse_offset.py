@@ -1,15 +1,20 @@
 import datetime
+import functools
 import re
 
-import tzlocal
-
 
 exif_offset_re = re.compile("([+-])(\\d\\d):(\\d\\d)", re.ASCII)
 
+@functools.lru_cache(maxsize=256)
 def parse_offset(string: str) -> datetime.tzinfo:
+    """
+    Pictures of a library share a handful of offsets, so the time zone of
+    each distinct string is created once, and the same object is returned for
+    every picture.
+    """
     match = exif_offset_re.fullmatch(string)
     if not match:
-        return tzlocal.get_localzone()
+        return local_timezone()
     delta = datetime.timedelta(
         hours=int(match.group(2)),
         minutes=int(match.group(3)),
@@ -17,3 +22,22 @@ def parse_offset(string: str) -> datetime.tzinfo:
     if match.group(1) == "-":
         delta = -delta
     return datetime.timezone(delta, string)
+
+
+@functools.cache
+def local_timezone() -> datetime.tzinfo:
+    """
+    :return: the local time zone, resolved once per run.
+    """
+    # tzlocal is imported on first use, not to slow down --help
+    import tzlocal
+    return tzlocal.get_localzone()
+
+
+@functools.cache
+def current_timezone() -> datetime.tzinfo:
+    """
+    :return: the offset of local time from UTC when first called, as a fixed
+      time zone.
+    """
+    return datetime.datetime.now().astimezone().tzinfo
@@ -1,14 +1,183 @@
 import sys
+from typing import Iterable, TYPE_CHECKING
 
 from pisort.Arguments import Arguments
-from pisort.list_pictures import list_pictures
-from pisort.sort_pictures import sort_pictures
+from pisort.exceptions import CorruptJournalException, MergeException, PendingJournalException
 
-if __name__ == "__main__":
+if TYPE_CHECKING:
+    from pisort.Picture import Picture
+
+# The other modules are imported once the arguments are parsed, so that
+# --help and usage errors don't pay for exifread, sqlite3 and thread pools.
+
+
+def describe(error: Exception) -> str:
+    if isinstance(error, FileExistsError):
+        return f"File already exist, will not overwrite: {error.filename}"
+    if isinstance(error, PendingJournalException):
+        return f"A previous sort was interrupted, use --resume or --rollback: {error}"
+    if isinstance(error, CorruptJournalException):
+        return "Files don’t match the journal of the interrupted sort"
+    return str(error)
+
+
+def print_duplicates(duplicates: Iterable[tuple["Picture", "Picture"]]) -> None:
+    for duplicate, original in duplicates:
+        print(f"{duplicate.path}: duplicate of {original.path.name}")
+
+
+def recover(args: Arguments) -> None:
+    from pisort.Journal import Journal
+    from pisort.sort_tree import list_folders
+
+    folders = list_folders(args.directories) if args.recursive else args.directories
+    for folder in folders:
+        journal = Journal(folder)
+        if not journal.exists():
+            continue
+        try:
+            if args.recover == "resume":
+                journal.resume()
+            else:
+                journal.rollback()
+            print(f"{folder}: {args.recover} done")
+        except (OSError, CorruptJournalException) as error:
+            print(f"{folder}: {describe(error)}", file=sys.stderr)
+            exit(2)
+
+
+def main() -> None:
     args = Arguments(sys.argv)
-    pics = list_pictures(args.directory)
+    if args.recover is not None:
+        recover(args)
+        exit(0)
+
+    from pisort.DateCache import DateCache, default_cache_path
+    from pisort.dedupe import dedupe
+    from pisort.Stats import Stats, no_stats
+    from pisort.dry_run import dry_run
+    from pisort.list_pictures import iter_pictures, list_pictures
+    from pisort.merge import dry_run_merge, merge
+    from pisort.sort_pictures import sort_pictures
+    from pisort.sort_tree import list_folders, sort_tree
+    from pisort.watch import watch
+
+    cache = DateCache(default_cache_path()) if args.cache else None
+    stats = Stats() if args.stats or args.stats_file is not None else no_stats
     try:
-        sort_pictures(pics, args.name, keep_good_names=args.keep_good_names)
-    except FileExistsError as error:
-        print(f"File already exist, will not overwrite: {error.filename}", file=sys.stderr)
+        if args.merge is not None and args.dry_run:
+            conflicts = dry_run_merge(
+                args.directories,
+                args.merge,
+                sys.stdout,
+                args.name,
+                keep_good_names=args.keep_good_names,
+                cache=cache,
+                stats=stats,
+            )
+            if conflicts > 0:
+                exit(2)
+        elif args.merge is not None:
+            try:
+                result = merge(
+                    args.directories,
+                    args.merge,
+                    args.name,
+                    keep_good_names=args.keep_good_names,
+                    cache=cache,
+                    stats=stats,
+                )
+            except MergeException as error:
+                print(f"{args.merge}: {describe(error.error)}", file=sys.stderr)
+                print(f"{args.merge}: {error.moved} files merged before the error", file=sys.stderr)
+                exit(2)
+            print(f"{args.merge}: {result.renamed} files merged")
+        elif args.dry_run:
+            folders = list_folders(args.directories) if args.recursive else args.directories
+            conflicts = 0
+            for folder in folders:
+                pics = list_pictures(folder, jobs=args.jobs, cache=cache, stats=stats)
+                duplicates = []
+                if args.dedupe:
+                    pics, duplicates = dedupe(pics, stats)
+                conflicts += dry_run(
+                    pics,
+                    sys.stdout,
+                    args.name,
+                    keep_good_names=args.keep_good_names,
+                    duplicates=duplicates,
+                )
+            if conflicts > 0:
+                exit(2)
+        elif args.watch:
+            folders = list(list_folders(args.directories)) if args.recursive else args.directories
+            for report in watch(
+                    folders,
+                    args.name,
+                    keep_good_names=args.keep_good_names,
+                    cache=cache,
+                    stats=stats,
+                    poll=args.poll,
+            ):
+                if report.error is None:
+                    print(
+                        f"{report.directory}: {report.renamed}/{report.pictures} renamed"
+                        f" in {report.operations} operations",
+                        flush=True,
+                    )
+                else:
+                    print(f"{report.directory}: {describe(report.error)}", file=sys.stderr, flush=True)
+        elif args.recursive:
+            failures = 0
+            for report in sort_tree(
+                    args.directories,
+                    args.name,
+                    keep_good_names=args.keep_good_names,
+                    jobs=args.jobs,
+                    cache=cache,
+                    stats=stats,
+                    dedupe=args.dedupe,
+            ):
+                if report.error is None:
+                    print(
+                        f"{report.directory}: {report.renamed}/{report.pictures} renamed"
+                        f" in {report.operations} operations"
+                    )
+                    print_duplicates(report.duplicates)
+                else:
+                    failures += 1
+                    print(f"{report.directory}: {describe(report.error)}", file=sys.stderr)
+            if failures > 0:
+                print(f"Failed to sort {failures} folders", file=sys.stderr)
+                exit(2)
+        else:
+            pics = iter_pictures(args.directory, jobs=args.jobs, cache=cache, stats=stats)
+            duplicates = []
+            if args.dedupe:
+                pics, duplicates = dedupe(pics, stats)
+            sort_pictures(
+                pics,
+                args.name,
+                keep_good_names=args.keep_good_names,
+                cache=cache,
+                stats=stats,
+                duplicates=duplicates,
+            )
+            print_duplicates(duplicates)
+    except (FileExistsError, PendingJournalException) as error:
+        print(describe(error), file=sys.stderr)
         exit(2)
+    except KeyboardInterrupt:
+        if not args.watch:
+            raise
+    finally:
+        if cache is not None:
+            cache.close()
+        if args.stats:
+            stats.print(sys.stderr)
+        if args.stats_file is not None:
+            stats.write(args.stats_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import uuid
+from pathlib import PurePath
+
+from pisort.Journal import Rename
+
+
+def plan_renames(moves: dict[str, str], inodes: dict[str, int]) -> list[list[Rename]]:
+    """
+    Plan the renames of files of a directory with as few operations as
+    possible.
+
+    Files already having their target name aren’t renamed. Chains of files,
+    where each file takes the name of the next one and the last one takes a
+    free name, are renamed starting from the end of the chain. Cycles are
+    broken by moving one file to a temporary name.
+
+    :param moves: the target name of each file, by current name. Target names
+      must be distinct, and either free, or the current name of a file.
+    :param inodes: the inode of each file, by current name.
+    :return: independent sequences of renames.
+    """
+    moves = {source: target for source, target in moves.items() if source != target}
+    targets = set(moves.values())
+    sequences = []
+
+    def chain(start: str) -> list[str]:
+        names = [start]
+        while names[-1] in moves and moves[names[-1]] != start:
+            names.append(moves[names[-1]])
+        return names
+
+    for source in moves:
+        if source not in targets:
+            names = chain(source)
+            sequences.append([
+                Rename(names[i], names[i + 1], inodes[names[i]])
+                for i in reversed(range(len(names) - 1))
+            ])
+    done = {rename.source for sequence in sequences for rename in sequence}
+    for source in moves:
+        if source not in done:
+            names = chain(source)
+            done.update(names)
+            temp = str(uuid.uuid4()) + PurePath(source).suffix
+            sequences.append(
+                [Rename(names[0], temp, inodes[names[0]])]
+                + [
+                    Rename(names[i - 1], names[i % len(names)], inodes[names[i - 1]])
+                    for i in reversed(range(2, len(names) + 1))
+                ]
+                + [Rename(temp, names[1], inodes[names[0]])]
+            )
+    return sequences
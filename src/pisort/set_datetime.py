@@ -1,21 +1,39 @@
 import datetime
 import getopt
+import io
+import mmap
+import os
+import shutil
 import sys
+import tempfile
+import time
+from enum import Enum
 from pathlib import Path
-from typing import Any
-
-import piexif
-import tzlocal
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
 
+from pisort.batch import input_paths, map_ordered, parse_jobs
+from pisort.exif_tags import TagLocation, find_tiff_header, locate_tags
 from pisort.fmt_offset import fmt_offset
-
+from pisort.parse_offset import local_timezone
 
 ImageIFD = "0th"
 ExifIFD = "Exif"
 
-tz = tzlocal.get_localzone()
+class Outcome(Enum):
+    WRITTEN = "written"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class Result(NamedTuple):
+    outcome: Outcome
+    size: int
+    """Size of the file."""
+
 
 def has_datetime(exif: dict[str, dict[int, Any]]) -> bool:
+    # piexif is imported on first use, not to slow down --help
+    import piexif
     for key in [
         (ExifIFD, piexif.ExifIFD.DateTimeOriginal),
         (ExifIFD, piexif.ExifIFD.DateTimeDigitized),
@@ -25,34 +43,155 @@ def has_datetime(exif: dict[str, dict[int, Any]]) -> bool:
             return True
     return False
 
-def process(path: Path, force: bool) -> None:
+def write_atomically(path: Path, data: bytes | memoryview) -> None:
+    """
+    Replace the content of the file at `path`, through a temporary file, so
+    that it never appears partially written. Symbolic links are followed, and
+    the file they point to is replaced.
+    """
+    path = path.resolve()
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, temp)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+def locate_date_tags(path: Path) -> tuple[int, Optional[dict[str, TagLocation]]]:
+    """
+    Locate the date tags of a file, reading only the pages holding its Exif
+    metadata.
+
+    :return: the size of the file, and the location of its date tags, or None
+      if the file format isn’t supported.
+    """
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return size, None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                tiff = find_tiff_header(data)
+                if tiff is None:
+                    return size, None
+                return size, locate_tags(data, tiff)
+            except EOFError:
+                # Truncated metadata, left to piexif
+                return size, None
+
+def patch_in_place(path: Path, tags: dict[str, TagLocation], date: datetime.datetime) -> bool:
+    """
+    Overwrite the existing DateTimeOriginal and OffsetTimeOriginal values of
+    the file, without rewriting the rest of it.
+
+    :return: whether the tags exist with the expected size, and were
+      overwritten.
+    """
+    date_value = date.strftime("%Y:%m:%d %H:%M:%S").encode("ascii") + b"\0"
+    offset_value = fmt_offset(date).encode("ascii") + b"\0"
+    date_location = tags.get("EXIF DateTimeOriginal")
+    offset_location = tags.get("EXIF OffsetTimeOriginal")
+    if date_location is None or date_location.count != len(date_value):
+        return False
+    if offset_location is None or offset_location.count != len(offset_value):
+        return False
+    fd = os.open(path, os.O_WRONLY)
     try:
-        exif = piexif.load(str(path))
+        os.pwrite(fd, date_value, date_location.offset)
+        os.pwrite(fd, offset_value, offset_location.offset)
+    finally:
+        os.close(fd)
+    return True
+
+def process(path: Path, force: bool) -> Result:
+    """
+    Set the Exif date of the file at `path` to its last modification time.
+
+    Existing date tags of JPEG and TIFF files are overwritten in place.
+    Otherwise, the file is read once, and written at most once.
+    """
+    try:
+        size, tags = locate_date_tags(path)
+    except OSError as e:
+        print(f"Failed to load {path}: {e}", file=sys.stderr)
+        return Result(Outcome.FAILED, 0)
+    if tags is not None:
+        if (not force) and any(tag in tags for tag in [
+            "EXIF DateTimeOriginal",
+            "EXIF DateTimeDigitized",
+            "Image DateTime",
+        ]):
+            return Result(Outcome.SKIPPED, size)
+        date = datetime.datetime.fromtimestamp(path.lstat().st_mtime, tz=local_timezone())
+        try:
+            if patch_in_place(path, tags, date):
+                print(f"Wrote {date} to {path}")
+                return Result(Outcome.WRITTEN, size)
+        except OSError as e:
+            print(f"Failed to write {path}: {e}", file=sys.stderr)
+            return Result(Outcome.FAILED, size)
+    return rewrite(path, force)
+
+def rewrite(path: Path, force: bool) -> Result:
+    """
+    Set the Exif date of the file by regenerating its whole Exif metadata.
+    """
+    import piexif
+    try:
+        data = path.read_bytes()
+        exif = piexif.load(data)
     except Exception as e:
         print(f"Failed to load {path}: {e}", file=sys.stderr)
-        return
+        return Result(Outcome.FAILED, 0)
     if (not force) and has_datetime(exif):
-        return
-    date = datetime.datetime.fromtimestamp(path.lstat().st_mtime, tz=tz)
+        return Result(Outcome.SKIPPED, len(data))
+    date = datetime.datetime.fromtimestamp(path.lstat().st_mtime, tz=local_timezone())
     if ExifIFD not in exif:
         exif[ExifIFD] = {}
     exif[ExifIFD][piexif.ExifIFD.DateTimeOriginal] = date.strftime("%Y:%m:%d %H:%M:%S")
     exif[ExifIFD][piexif.ExifIFD.OffsetTimeOriginal] = fmt_offset(date)
     binary = piexif.dump(exif)
-    piexif.insert(binary, str(path))
+    try:
+        output = io.BytesIO()
+        piexif.insert(binary, data, output)
+        write_atomically(path, output.getbuffer())
+    except Exception as e:
+        print(f"Failed to write {path}: {e}", file=sys.stderr)
+        return Result(Outcome.FAILED, len(data))
     print(f"Wrote {date} to {path}")
+    return Result(Outcome.WRITTEN, len(data))
+
+def process_all(paths: Iterable[Path], force: bool, jobs: int = 1) -> Iterator[Result]:
+    """
+    Process files, up to `jobs` at a time. Results are yielded in the order of
+    `paths`, which is consumed lazily.
+    """
+    return map_ordered(lambda path: process(path, force), paths, jobs)
 
 if __name__ == "__main__":
-    options, _ = getopt.getopt(sys.argv[1:], "fh", [
+    options, parameters = getopt.getopt(sys.argv[1:], "fhj:T:", [
+        "files-from=",
         "force",
         "help",
+        "jobs=",
     ])
 
     f = False
+    jobs = 1
+    files_from = None
     for k, v in options:
         match k:
             case "-f" | "--force":
                 f = True
+            case "-j" | "--jobs":
+                jobs = parse_jobs(sys.argv[0], v)
+            case "-T" | "--files-from":
+                files_from = v
             case "-h" | "--help":
                 print(f"""
 usage: {sys.argv[0]} [options] paths...
@@ -62,10 +201,30 @@ last modification time. Unless the `-f` option is specified, the date will
 not be set on files that already have one in their Exif metadata.
 
 Options:
- -h,--help      Display this help message and exit.
- -f,--force     Set the Exif date even if there is already one.
+ -h,--help              Display this help message and exit.
+ -f,--force             Set the Exif date even if there is already one.
+ -j,--jobs <n>          Process up to <n> files concurrently (default: 1).
+ -T,--files-from <file> Also process the files listed in <file>, one per line.
+                        Use - to read the list from the standard input.
 """)
                 exit(0)
 
-    for filename in sys.argv[1:]:
-        process(Path(filename), f)
+    paths = input_paths(parameters, files_from)
+
+    start = time.perf_counter()
+    counts = {outcome: 0 for outcome in Outcome}
+    size = 0
+    for result in process_all(paths, f, jobs):
+        counts[result.outcome] += 1
+        size += result.size
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    total = sum(counts.values())
+    if total > 1:
+        print(
+            f"Processed {total} files in {elapsed:.1f} s"
+            f" ({total / elapsed:.1f} files/s, {size / elapsed / 1024 / 1024:.1f} MiB/s): "
+            + ", ".join(f"{counts[outcome]} {outcome.value}" for outcome in Outcome),
+            file=sys.stderr,
+        )
+    if counts[Outcome.FAILED] > 0:
+        exit(1)
@@ -1,48 +1,247 @@
-import datetime
 import errno
+import os
 import re
-import uuid
-from typing import Optional
+from pathlib import Path
+from typing import Container, Iterable, Iterator, NamedTuple, Optional
 
+from pisort.DateCache import DateCache
+from pisort.Journal import Journal, Rename, snapshot
 from pisort.Picture import Picture
+from pisort.PictureIndex import PictureIndex
+from pisort.Stats import Stats, no_stats
+from pisort.exceptions import PendingJournalException
+from pisort.plan_renames import plan_renames
 
-max_date = datetime.datetime(
-    datetime.MAXYEAR, 12, 31,
-    tzinfo=datetime.timezone.utc,
-)
 new_stem_re = re.compile("\\d+ - (.*)")
 
 
+class SortResult(NamedTuple):
+    renamed: int
+    """Number of pictures whose name changed."""
+    operations: int
+    """Number of rename operations performed."""
+
+
+def plan_sort(
+        pictures: Iterable[Picture],
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+) -> list[tuple[Picture, Path]]:
+    """
+    Compute the new paths of pictures, after their chronological order.
+
+    :return: pictures in chronological order, with their new path.
+    """
+    return plan_range(PictureIndex(pictures), 0, name, keep_good_names)
+
+
+def plan_range(
+        index: PictureIndex,
+        start: int = 0,
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+) -> list[tuple[Picture, Path]]:
+    """
+    Compute the new paths of the pictures of the index from position `start`
+    on, the previous ones keeping theirs.
+
+    :return: pictures in chronological order, with their new path.
+    """
+    width = index_width(len(index))
+    return [
+        (index[i], index[i].path.with_stem(new_stem(index[i], i, width, name, keep_good_names)))
+        for i in range(start, len(index))
+    ]
+
+
+def index_width(count: int) -> int:
+    """
+    :return: the number of digits of the indexes of `count` pictures.
+    """
+    return len(str(count - 1))
+
+
+def new_stem(
+        picture: Picture,
+        index: int,
+        width: int,
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+) -> str:
+    """
+    :return: the stem of the picture at the given index of its folder.
+    """
+    new_name = name
+    if keep_good_names and (match := new_stem_re.fullmatch(picture.path.stem)):
+        new_name = match.group(1)
+    if new_name is None:
+        return f"{index:0{width}}"
+    else:
+        return f"{index:0{width}} - {new_name}"
+
+
+def plan_duplicates(
+        plan: list[tuple[Picture, Path]],
+        duplicates: Iterable[tuple[Picture, Picture]],
+) -> list[tuple[Picture, Path]]:
+    """
+    Compute the new paths of duplicates left out of the plan, so that they
+    don’t stand in the way of the numbered pictures. Each is named after the
+    new stem of the picture it duplicates, followed by "~dup" and a number,
+    which sorts after that picture, so that the same one is kept next time.
+
+    :param duplicates: pictures left out of the plan, each with the planned
+      picture it duplicates.
+    :return: duplicates, with their new path.
+    """
+    new_paths = {picture: new_path for picture, new_path in plan}
+    counts: dict[Picture, int] = {}
+    result = []
+    for duplicate, original in duplicates:
+        counts[original] = counts.get(original, 0) + 1
+        new_stem = f"{new_paths[original].stem}~dup{counts[original]}"
+        result.append((duplicate, duplicate.path.with_name(new_stem + duplicate.path.suffix)))
+    return result
+
+
+def find_conflicts(
+        plan: list[tuple[Picture, Path]],
+        names: Optional[Container[str]] = None,
+) -> Iterator[tuple[Picture, Path, bool]]:
+    """
+    Check whether planned renames would overwrite files other than the
+    planned pictures.
+
+    Targets are looked up in a listing of their directory rather than stat
+    one by one, and only the few found there are checked again on disk, in
+    case they have been removed since.
+
+    :param names: names of the entries of the directory of the pictures. By
+      default, each directory is listed once.
+    :return: each planned rename, with whether it would overwrite a file.
+    """
+    current_paths = {picture.path for picture, _ in plan}
+    listings: dict[Path, Container[str]] = {}
+    for picture, new_path in plan:
+        conflict = False
+        if new_path not in current_paths:
+            directory = new_path.parent
+            if directory not in listings:
+                listings[directory] = snapshot(directory) if names is None else names
+            conflict = new_path.name in listings[directory] and os.path.lexists(new_path)
+        yield picture, new_path, conflict
+
+
 def sort_pictures(
-        pictures: list[Picture],
+        pictures: Iterable[Picture],
         name: Optional[str] = None,
         keep_good_names: bool = True,
-) -> None:
-    index_format = f"{{:0{len(str(len(pictures) - 1))}}}"
-
-    def compute_new_stem(picture: Picture, index: int):
-        new_name = name
-        if keep_good_names and (match := new_stem_re.fullmatch(picture.path.stem)):
-            new_name = match.group(1)
-        if new_name is None:
-            return index_format.format(index)
-        else:
-            return index_format.format(index) + " - " + new_name
-
-    pictures = sorted(pictures, key=lambda p: p.path.name)
-    pictures = sorted(pictures, key=lambda p: p.date() or max_date)
-    new_stems = [compute_new_stem(pictures[i], i) for i in range(len(pictures))]
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+        duplicates: Iterable[tuple[Picture, Picture]] = (),
+) -> SortResult:
+    """
+    Rename pictures after their chronological order. Pictures must all be in
+    the same directory.
+
+    :param duplicates: pictures left out of the numbering, each with the
+      picture it duplicates. They are renamed by plan_duplicates(), in the
+      same journal.
+    :raise PendingJournalException: a previous sort of the directory was
+      interrupted.
+    """
+    # Read pictures first, so that listing them isn’t counted as planning
+    pictures = list(pictures)
+    with stats.phase("plan"):
+        plan = plan_sort(pictures, name, keep_good_names)
+        plan += plan_duplicates(plan, duplicates)
+    return rename_pictures(plan, cache, stats)
+
+
+def rename_pictures(
+        plan: list[tuple[Picture, Path]],
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> SortResult:
+    """
+    Rename pictures to their planned path, and update their `path`. Pictures
+    must all be in the same directory.
+
+    :raise PendingJournalException: a previous sort of the directory was
+      interrupted.
+    """
+    if len(plan) == 0:
+        return SortResult(0, 0)
+    journal, sequences = prepare_renames(plan, stats)
+    with stats.phase("rename"):
+        if len(sequences) > 0:
+            journal.run(sequences)
+    return record_renames(plan, sequences, cache, stats)
+
+
+def prepare_renames(
+        plan: list[tuple[Picture, Path]],
+        stats: Stats = no_stats,
+) -> tuple[Journal, list[list[Rename]]]:
+    """
+    Check that the planned renames can be performed, and order them. The plan
+    must not be empty.
+
+    :return: the journal of the directory, and the sequences of renames to
+      run through it.
+    :raise PendingJournalException: a previous sort of the directory was
+      interrupted.
+    :raise FileExistsError: a rename would overwrite another file.
+    """
+    directory = plan[0][0].path.parent
+    if any(picture.path.parent != directory for picture, _ in plan):
+        raise ValueError("Pictures must all be in the same directory")
+    journal = Journal(directory)
+    if journal.exists():
+        raise PendingJournalException(journal.path)
 
     # Check we won’t overwrite anything
-    current_paths = {picture.path for picture in pictures}
-    for i in range(len(pictures)):
-        new_path = pictures[i].path.with_stem(new_stems[i])
-        if new_path not in current_paths and new_path.exists():
-            raise FileExistsError(errno.EEXIST, "Target file already exists", str(new_path))
-
-    # Rename in two steps:
-    # We can have file foo and bar with foo.new_name == bar.old_name
-    for picture in pictures:
-        picture.rename_to(str(uuid.uuid4()))
-    for i in range(len(pictures)):
-        pictures[i].rename_to(new_stems[i])
+    with stats.phase("conflicts"):
+        inodes = snapshot(directory)
+        for _, new_path, conflict in find_conflicts(plan, inodes):
+            if conflict:
+                raise FileExistsError(errno.EEXIST, "Target file already exists", str(new_path))
+
+    # We can have file foo and bar with foo.new_name == bar.old_name, so
+    # renames must be ordered, and cycles broken with a temporary name.
+    with stats.phase("plan"):
+        sequences = plan_renames(
+            {picture.path.name: new_path.name for picture, new_path in plan},
+            inodes,
+        )
+    return journal, sequences
+
+
+def record_renames(
+        plan: list[tuple[Picture, Path]],
+        sequences: list[list[Rename]],
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+) -> SortResult:
+    """
+    Update the path of pictures, and the cache, once the planned renames are
+    done.
+    """
+    pictures = [picture for picture, _ in plan]
+    old_paths = [picture.path for picture in pictures]
+    for picture, new_path in plan:
+        picture.path = new_path
+
+    if cache is not None:
+        with stats.phase("cache"):
+            cache.moved([(old_paths[i], pictures[i].path) for i in range(len(pictures))])
+            cache.commit()
+
+    result = SortResult(
+        sum(1 for i in range(len(pictures)) if pictures[i].path != old_paths[i]),
+        sum(len(sequence) for sequence in sequences),
+    )
+    stats.count("renamed", result.renamed)
+    stats.count("unchanged", len(pictures) - result.renamed)
+    stats.count("rename operations", result.operations)
+    return result
@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from pisort.DateCache import DateCache
+from pisort.Picture import Picture
+from pisort.Stats import Stats, no_stats
+from pisort.dedupe import dedupe as dedupe_pictures
+from pisort.list_pictures import list_pictures
+from pisort.sort_pictures import sort_pictures
+
+
+class FolderReport(NamedTuple):
+    directory: Path
+    pictures: int
+    renamed: int
+    operations: int
+    error: Optional[Exception]
+    duplicates: Sequence[tuple[Picture, Picture]] = ()
+    """Pictures left out of the sort, with the picture they duplicate."""
+
+
+def list_folders(roots: list[Path]) -> Iterator[Path]:
+    """
+    Yield the given directories and all their non-hidden subdirectories.
+    """
+    for root in roots:
+        for directory, subdirectories, _ in os.walk(root):
+            subdirectories[:] = sorted(d for d in subdirectories if not d.startswith("."))
+            yield Path(directory)
+
+
+def sort_tree(
+        roots: list[Path],
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+        jobs: int = 1,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+        dedupe: bool = False,
+) -> Iterator[FolderReport]:
+    """
+    Sort each folder of the given directory trees independently, up to `jobs`
+    folders at a time.
+
+    :param dedupe: leave duplicates out of the numbering of each folder, see
+      plan_duplicates().
+
+    A failure in one folder is reported and doesn’t prevent sorting the
+    others. Reports are yielded in the order of list_folders().
+    """
+    def sort_folder(directory: Path) -> FolderReport:
+        pictures = []
+        duplicates = []
+        try:
+            pictures = list_pictures(directory, cache=cache, stats=stats)
+            if dedupe:
+                pictures, duplicates = dedupe_pictures(pictures, stats)
+            result = sort_pictures(
+                pictures,
+                name,
+                keep_good_names=keep_good_names,
+                cache=cache,
+                stats=stats,
+                duplicates=duplicates,
+            )
+            return FolderReport(directory, len(pictures), result.renamed, result.operations, None, duplicates)
+        except Exception as error:
+            return FolderReport(directory, len(pictures), 0, 0, error)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(sort_folder, list_folders(roots))
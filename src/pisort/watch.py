@@ -0,0 +1,304 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import stat
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from pisort.DateCache import DateCache
+from pisort.Picture import Picture
+from pisort.PictureIndex import PictureIndex
+from pisort.Stats import Stats, no_stats
+from pisort.list_pictures import load_cached_picture
+from pisort.sort_pictures import SortResult, index_width, plan_range, rename_pictures
+from pisort.sort_tree import FolderReport
+
+Signature = tuple[int, int, int]
+"""Inode, size and modification time of a file, telling whether it changed."""
+
+IN_CREATE = 0x100
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_DELETE = 0x200
+IN_ONLYDIR = 0x1000000
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+
+event_header = struct.Struct("iIII")
+
+default_debounce = 2.0
+default_poll_interval = 10.0
+
+
+class Inotify:
+    """
+    Minimal binding of the Linux inotify API, through ctypes.
+
+    :raise OSError: inotify is not available on this system.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self.fd = self._check(libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC))
+
+    def add(self, directory: Path) -> int:
+        """
+        Watch files of the directory being created, written, moved or
+        deleted.
+
+        :return: the watch descriptor, found in events of this directory.
+        """
+        return self._check(self._libc.inotify_add_watch(
+            self.fd,
+            os.fsencode(directory),
+            IN_CREATE | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_ONLYDIR,
+        ))
+
+    def read(self, timeout: Optional[float] = None) -> list[tuple[int, int, str]]:
+        """
+        Wait up to `timeout` seconds for events.
+
+        :return: the watch descriptor, mask and file name of each event, or
+          an empty list on timeout.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = event_header.unpack_from(data, offset)
+            offset += event_header.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def _check(result: int) -> int:
+        if result < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        return result
+
+
+class WatchedFolder:
+    """
+    Pictures of a directory, kept in chronological order in memory, as files
+    arrive, change or leave. Only new or changed files are read, and only the
+    pictures whose index shifted since the last sort are renamed.
+    """
+
+    def __init__(
+            self,
+            directory: Path,
+            name: Optional[str] = None,
+            keep_good_names: bool = True,
+            cache: Optional[DateCache] = None,
+            stats: Stats = no_stats,
+    ):
+        self.directory = directory
+        self.name = name
+        self.keep_good_names = keep_good_names
+        self.cache = cache
+        self.stats = stats
+        self.signatures: dict[str, Signature] = {}
+        """Files known in the directory, pictures or not, by name."""
+        self.pictures: dict[str, Picture] = {}
+        self.index = PictureIndex()
+        self.sorted_version: Optional[int] = None
+        """Version of the index at the last sort, None before the first."""
+        self.width: Optional[int] = None
+
+    def update(self, names: Optional[Iterable[str]] = None) -> bool:
+        """
+        Read the files that changed since the last update.
+
+        :param names: names of the files that may have changed. By default,
+          the whole directory is scanned.
+        :return: whether pictures were added, changed or removed.
+        """
+        if names is None:
+            found: dict[str, os.stat_result] = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        found[entry.name] = entry.stat()
+            names = set(found) | set(self.signatures)
+            lookup: Callable[[str], Optional[os.stat_result]] = found.get
+        else:
+            lookup = self._stat
+
+        changed = False
+        try:
+            for filename in names:
+                file_stat = lookup(filename)
+                signature = None if file_stat is None else (
+                    file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns,
+                )
+                if signature == self.signatures.get(filename):
+                    continue
+                changed |= self._remove(filename)
+                if signature is not None:
+                    self.signatures[filename] = signature
+                    picture = load_cached_picture(self.directory / filename, file_stat, self.cache, self.stats)
+                    if picture is not None:
+                        self._insert(picture)
+                        changed = True
+        finally:
+            if self.cache is not None:
+                self.cache.commit()
+        return changed
+
+    def sort(self) -> SortResult:
+        """
+        Rename the pictures whose index changed since the last sort, or all
+        of them if the number of digits of indexes changed.
+        """
+        width = index_width(len(self.index))
+        if self.sorted_version is None or width != self.width:
+            start = 0
+        elif (start := self.index.changed_since(self.sorted_version)) is None:
+            return SortResult(0, 0)
+        plan = plan_range(self.index, start, self.name, self.keep_good_names)
+        old_names = [picture.path.name for picture, _ in plan]
+        result = rename_pictures(plan, self.cache, self.stats)
+        self.index.refresh(start)
+
+        # Follow the renames, so that they aren’t taken for new files
+        moved = [(self.pictures.pop(name), self.signatures.pop(name)) for name in old_names]
+        for picture, signature in moved:
+            self.pictures[picture.path.name] = picture
+            self.signatures[picture.path.name] = signature
+        self.width = width
+        self.sorted_version = self.index.version
+        self.index.forget(self.sorted_version)
+        return result
+
+    def process(self, names: Optional[Iterable[str]] = None) -> Optional[FolderReport]:
+        """
+        Update, then sort the folder if pictures changed.
+
+        :return: the outcome of the sort, or None if nothing changed.
+        """
+        try:
+            if not self.update(names) and self.sorted_version == self.index.version:
+                return None
+            result = self.sort()
+            return FolderReport(self.directory, len(self.index), result.renamed, result.operations, None)
+        except Exception as error:
+            return FolderReport(self.directory, len(self.index), 0, 0, error)
+
+    def _stat(self, filename: str) -> Optional[os.stat_result]:
+        """
+        :return: the status of the file, following symbolic links like the
+          scan of update(), or None if it isn’t a regular file.
+        """
+        try:
+            file_stat = (self.directory / filename).stat()
+        except FileNotFoundError:
+            return None
+        return file_stat if stat.S_ISREG(file_stat.st_mode) else None
+
+    def _insert(self, picture: Picture) -> None:
+        self.index.insert(picture)
+        self.pictures[picture.path.name] = picture
+
+    def _remove(self, filename: str) -> bool:
+        """
+        Forget a file.
+
+        :return: whether it was a picture.
+        """
+        self.signatures.pop(filename, None)
+        picture = self.pictures.pop(filename, None)
+        if picture is None:
+            return False
+        self.index.remove(picture)
+        return True
+
+
+def watch(
+        directories: list[Path],
+        name: Optional[str] = None,
+        keep_good_names: bool = True,
+        cache: Optional[DateCache] = None,
+        stats: Stats = no_stats,
+        debounce: float = default_debounce,
+        poll: Optional[float] = None,
+) -> Iterator[FolderReport]:
+    """
+    Sort the directories, then keep them sorted as files arrive, until
+    interrupted. A report is yielded for each sort.
+
+    Changes are noticed through inotify, and handled once no other change
+    happened for `debounce` seconds, so that files being uploaded are read
+    once complete, and a burst of arrivals is sorted at once.
+
+    :param poll: interval in seconds between scans of every directory,
+      instead of relying on inotify. Directories are polled every
+      `default_poll_interval` seconds when inotify is not available.
+    """
+    folders = [WatchedFolder(directory, name, keep_good_names, cache, stats) for directory in directories]
+    inotify = None
+    if poll is None:
+        try:
+            inotify = Inotify()
+        except OSError:
+            poll = default_poll_interval
+
+    if inotify is None:
+        while True:
+            for folder in folders:
+                if (report := folder.process()) is not None:
+                    yield report
+            time.sleep(poll)
+
+    with inotify:
+        # Watch before the first scan, so that no arrival is missed in between
+        watched = {inotify.add(folder.directory): folder for folder in folders}
+        for folder in folders:
+            if (report := folder.process()) is not None:
+                yield report
+        # Names of changed files by folder, or None to scan the whole folder
+        changes: dict[WatchedFolder, Optional[set[str]]] = {}
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            events = inotify.read(timeout)
+            for wd, mask, filename in events:
+                if mask & IN_Q_OVERFLOW:
+                    changes = {folder: None for folder in folders}
+                elif wd in watched and not mask & IN_ISDIR:
+                    names = changes.setdefault(watched[wd], set())
+                    if names is not None:
+                        names.add(filename)
+            if len(events) > 0:
+                deadline = time.monotonic() + debounce
+            elif deadline is not None and time.monotonic() >= deadline:
+                for folder, names in changes.items():
+                    if (report := folder.process(names)) is not None:
+                        yield report
+                changes = {}
+                deadline = None
@@ -150,3 +150,154 @@ class ArgumentsTest(unittest.TestCase):
 
         print_mock.assert_called()
         exit_mock.assert_called_once_with(0)
+
+    def test_one_job_by_default(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test"])
+
+        self.assertEqual(1, arguments.jobs)
+        print_mock.assert_not_called()
+        exit_mock.assert_not_called()
+
+    def test_jobs(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "--jobs", "8"])
+
+        self.assertEqual(8, arguments.jobs)
+        print_mock.assert_not_called()
+        exit_mock.assert_not_called()
+
+    def test_j(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "-j4"])
+
+        self.assertEqual(4, arguments.jobs)
+        print_mock.assert_not_called()
+        exit_mock.assert_not_called()
+
+    def test_reject_invalid_jobs(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--jobs", "0"])
+
+        print_mock.assert_called_once_with("test: Invalid number of jobs: 0", file=sys.stderr)
+        exit_mock.assert_called_once_with(1)
+
+    def test_reject_non_ascii_jobs(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--jobs", "²"])
+
+        print_mock.assert_called_once_with("test: Invalid number of jobs: ²", file=sys.stderr)
+        exit_mock.assert_called_once_with(1)
+
+    def test_cache_by_default(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test"])
+
+        self.assertTrue(arguments.cache)
+        print_mock.assert_not_called()
+        exit_mock.assert_not_called()
+
+    def test_no_cache(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "--no-cache"])
+
+        self.assertFalse(arguments.cache)
+        print_mock.assert_not_called()
+        exit_mock.assert_not_called()
+
+    def test_not_recursive_by_default(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test"])
+
+        self.assertFalse(arguments.recursive)
+        self.assertEqual([Path()], arguments.directories)
+
+    def test_recursive_accepts_several_directories(self, print_mock: Mock, exit_mock: Mock) -> None:
+        other = Path(self.temp_dir.name) / "other"
+        other.mkdir()
+
+        arguments = Arguments(["test", "-r", self.temp_dir.name, str(other)])
+
+        self.assertTrue(arguments.recursive)
+        self.assertEqual([Path(self.temp_dir.name), other], arguments.directories)
+        print_mock.assert_not_called()
+        exit_mock.assert_not_called()
+
+    def test_no_recovery_by_default(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test"])
+
+        self.assertIsNone(arguments.recover)
+
+    def test_resume(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "--resume"])
+
+        self.assertEqual("resume", arguments.recover)
+
+    def test_rollback(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "--rollback"])
+
+        self.assertEqual("rollback", arguments.recover)
+
+    def test_dry_run(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertFalse(Arguments(["test"]).dry_run)
+        self.assertTrue(Arguments(["test", "--dry-run"]).dry_run)
+        self.assertTrue(Arguments(["test", "-n"]).dry_run)
+
+    def test_stats(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "--stats", "--stats-file", "stats.json"])
+
+        self.assertTrue(arguments.stats)
+        self.assertEqual(Path("stats.json"), arguments.stats_file)
+
+    def test_no_stats_by_default(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test"])
+
+        self.assertFalse(arguments.stats)
+        self.assertIsNone(arguments.stats_file)
+
+    def test_watch(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertFalse(Arguments(["test"]).watch)
+        self.assertTrue(Arguments(["test", "--watch"]).watch)
+        self.assertIsNone(Arguments(["test", "--watch"]).poll)
+
+    def test_poll(self, print_mock: Mock, exit_mock: Mock) -> None:
+        arguments = Arguments(["test", "--poll", "2.5"])
+
+        self.assertTrue(arguments.watch)
+        self.assertEqual(2.5, arguments.poll)
+
+    def test_reject_invalid_poll_interval(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--poll", "0"])
+
+        print_mock.assert_called_once_with("test: Invalid polling interval: 0", file=sys.stderr)
+        exit_mock.assert_called_once_with(1)
+
+    def test_reject_watch_with_dry_run(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--watch", "--dry-run"])
+
+        exit_mock.assert_called_once_with(1)
+
+    def test_reject_recover_with_dry_run(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--dry-run", "--rollback"])
+
+        print_mock.assert_called_once_with("test: --dry-run can’t be combined with --rollback", file=sys.stderr)
+        exit_mock.assert_called_once_with(1)
+
+    def test_dedupe(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertFalse(Arguments(["test"]).dedupe)
+        self.assertTrue(Arguments(["test", "--dedupe"]).dedupe)
+
+    def test_merge(self, print_mock: Mock, exit_mock: Mock) -> None:
+        source = Path(self.temp_dir.name) / "source"
+        source.mkdir()
+
+        arguments = Arguments(["test", "--merge", str(Path(self.temp_dir.name) / "album"), str(source), "."])
+
+        self.assertEqual(Path(self.temp_dir.name) / "album", arguments.merge)
+        self.assertEqual([source, Path(".")], arguments.directories)
+        exit_mock.assert_not_called()
+
+    def test_reject_merge_into_source(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--merge", self.temp_dir.name, ".", self.temp_dir.name])
+
+        print_mock.assert_called_once_with(
+            f"test: Can’t merge into one of the merged directories: {self.temp_dir.name}",
+            file=sys.stderr,
+        )
+
+    def test_reject_merge_with_recursive(self, print_mock: Mock, exit_mock: Mock) -> None:
+        self.assertRaises(Exit, Arguments, ["test", "--merge", "album", "-r", "."])
+
+        exit_mock.assert_called_once_with(1)
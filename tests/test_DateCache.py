@@ -0,0 +1,87 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from pisort.DateCache import DateCache
+
+date = datetime.datetime(2023, 8, 13, 21, 47, 50, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+
+
+class DateCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.dir.name)
+        self.cache = DateCache(self.root / "cache" / "dates.sqlite3")
+        self.file = self.root / "picture.png"
+        self.file.write_bytes(b"picture")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self.dir.cleanup()
+
+    def test_get_cached_date(self) -> None:
+        self.cache.put(self.file, self.file.stat(), date)
+
+        actual = self.cache.get(self.file, self.file.stat())
+
+        self.assertEqual(date, actual)
+        self.assertEqual(date.utcoffset(), actual.utcoffset())
+
+    def test_get_cached_absence_of_date(self) -> None:
+        self.cache.put(self.file, self.file.stat(), None)
+
+        self.assertIsNone(self.cache.get(self.file, self.file.stat()))
+
+    def test_miss(self) -> None:
+        self.assertRaises(KeyError, self.cache.get, self.file, self.file.stat())
+
+    def test_invalidate_modified_file(self) -> None:
+        self.cache.put(self.file, self.file.stat(), date)
+        os.utime(self.file, ns=(0, 0))
+
+        self.assertRaises(KeyError, self.cache.get, self.file, self.file.stat())
+
+    def test_invalidate_replaced_file(self) -> None:
+        self.cache.put(self.file, self.file.stat(), date)
+        other = self.root / "other.png"
+        other.write_bytes(b"picture")
+        os.utime(other, ns=(self.file.stat().st_atime_ns, self.file.stat().st_mtime_ns))
+        other.replace(self.file)
+
+        self.assertRaises(KeyError, self.cache.get, self.file, self.file.stat())
+
+    def test_persist(self) -> None:
+        self.cache.put(self.file, self.file.stat(), date)
+        self.cache.close()
+
+        self.cache = DateCache(self.root / "cache" / "dates.sqlite3")
+
+        self.assertEqual(date, self.cache.get(self.file, self.file.stat()))
+
+    def test_drop_entries_of_other_version(self) -> None:
+        self.cache.put(self.file, self.file.stat(), None)
+        self.cache.close()
+        with sqlite3.connect(self.root / "cache" / "dates.sqlite3") as connection:
+            connection.execute("PRAGMA user_version = 0")
+        connection.close()
+
+        self.cache = DateCache(self.root / "cache" / "dates.sqlite3")
+
+        self.assertRaises(KeyError, self.cache.get, self.file, self.file.stat())
+        self.cache.put(self.file, self.file.stat(), date)
+        self.assertEqual(date, self.cache.get(self.file, self.file.stat()))
+
+    def test_moved(self) -> None:
+        other = self.root / "other.png"
+        self.cache.put(self.file, self.file.stat(), date)
+        self.cache.put(other, self.file.stat(), None)
+        self.file.rename(other)
+
+        self.cache.moved([(self.file, other)])
+
+        self.assertEqual(date, self.cache.get(other, other.stat()))
+        self.assertRaises(KeyError, self.cache.get, self.file, other.stat())
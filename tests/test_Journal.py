@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from pisort.Journal import Journal, Rename, progress, snapshot
+from pisort.exceptions import CorruptJournalException
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.dir.name)
+        for name in ["a", "b", "c"]:
+            (self.root / name).write_text(name)
+        self.inodes = snapshot(self.root)
+        # Rotate a -> b -> c -> a
+        self.sequence = [
+            Rename("a", "t", self.inodes["a"]),
+            Rename("c", "a", self.inodes["c"]),
+            Rename("b", "c", self.inodes["b"]),
+            Rename("t", "b", self.inodes["a"]),
+        ]
+        self.journal = Journal(self.root)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def interrupt_after(self, count: int) -> None:
+        self.journal.write([self.sequence])
+        self.journal.rename(self.sequence[:count])
+
+    def assertContents(self, expected: dict[str, str]) -> None:
+        actual = {p.name: p.read_text() for p in self.root.iterdir() if p.name != ".pisort-journal"}
+        self.assertEqual(expected, actual)
+
+    def test_run(self) -> None:
+        self.journal.run([self.sequence])
+
+        self.assertContents({"a": "c", "b": "a", "c": "b"})
+        self.assertFalse(self.journal.exists())
+
+    def test_progress(self) -> None:
+        for count in range(len(self.sequence) + 1):
+            with self.subTest(count=count):
+                self.journal.rename(self.sequence[:count])
+
+                self.assertEqual(count, progress(self.sequence, snapshot(self.root)))
+
+                self.journal.rename([Rename(r.target, r.source, r.inode) for r in reversed(self.sequence[:count])])
+
+    def test_progress_of_hardlinks(self) -> None:
+        (self.root / "a").unlink()
+        (self.root / "a").hardlink_to(self.root / "b")
+        inode = snapshot(self.root)["b"]
+        sequence = [Rename("a", "t", inode), Rename("b", "a", inode), Rename("t", "b", inode)]
+        self.journal.rename(sequence)
+
+        self.assertEqual(3, progress(sequence, snapshot(self.root)))
+
+    def test_resume(self) -> None:
+        for count in range(len(self.sequence) + 1):
+            with self.subTest(count=count):
+                self.interrupt_after(count)
+
+                self.journal.resume()
+
+                self.assertContents({"a": "c", "b": "a", "c": "b"})
+                self.assertFalse(self.journal.exists())
+                self.journal.rename([Rename(r.target, r.source, r.inode) for r in reversed(self.sequence)])
+
+    def test_rollback(self) -> None:
+        for count in range(len(self.sequence) + 1):
+            with self.subTest(count=count):
+                self.interrupt_after(count)
+
+                self.journal.rollback()
+
+                self.assertContents({"a": "a", "b": "b", "c": "c"})
+                self.assertFalse(self.journal.exists())
+
+    def test_corrupt(self) -> None:
+        self.interrupt_after(1)
+        os.unlink(self.root / "t")
+
+        self.assertRaises(CorruptJournalException, self.journal.resume)
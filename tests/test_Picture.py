@@ -1,8 +1,15 @@
 import datetime
+import io
+import mmap
+import os
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 
-from pisort.Picture import Picture
+from pisort.Picture import Picture, read_raw_dates
+from pisort.Stats import Stats
+from pisort.exceptions import NoExifDataException
 
 
 class PictureTest(unittest.TestCase):
@@ -52,3 +59,73 @@ class PictureTest(unittest.TestCase):
         actual = image.date()
 
         self.assertIsNone(actual)
+
+    def test_skip_thumbnail_by_default(self) -> None:
+        image = Picture(self.dir / "sample.jpg", keep_exif=True)
+
+        self.assertNotIn("JPEGThumbnail", image.exif)
+        self.assertIn("EXIF DateTimeOriginal", image.exif)
+
+    def test_details_parse_thumbnail(self) -> None:
+        image = Picture(self.dir / "sample.jpg", details=True, keep_exif=True)
+
+        self.assertIn("JPEGThumbnail", image.exif)
+
+    def test_drop_exif_by_default(self) -> None:
+        image = Picture(self.dir / "sample.jpg")
+
+        self.assertIsNone(image.exif)
+        self.assertIsNotNone(image.date())
+
+    def test_with_date(self) -> None:
+        date = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+        image = Picture.with_date(self.dir / "nonexistent.png", date)
+
+        self.assertEqual(date, image.date())
+        self.assertIsNone(image.exif)
+
+    def test_read_raw_dates_from_memory_map(self) -> None:
+        with (self.dir / "sample.jpg").open("rb") as f:
+            values = read_raw_dates(f)
+
+        self.assertEqual("2017:05:29 11:11:16", values["EXIF DateTimeOriginal"])
+
+    def test_read_raw_dates_without_memory_map(self) -> None:
+        data = (self.dir / "sample.jpg").read_bytes()
+        read, write = os.pipe()
+        writer = threading.Thread(target=lambda: (os.write(write, data), os.close(write)))
+        writer.start()
+        with os.fdopen(read, "rb") as pipe:
+            from_pipe = read_raw_dates(pipe)
+        writer.join()
+
+        from_memory = read_raw_dates(io.BytesIO(data))
+
+        self.assertEqual("2017:05:29 11:11:16", from_pipe["EXIF DateTimeOriginal"])
+        self.assertEqual(from_pipe, from_memory)
+
+    def test_count_bytes_read_through_memory_map(self) -> None:
+        stats = Stats()
+
+        Picture(self.dir / "sample.jpg", stats=stats)
+
+        # The date values of the sample are on the first page
+        self.assertGreaterEqual(stats.counters["bytes read"], mmap.PAGESIZE)
+        self.assertLess(stats.counters["bytes read"], 2 * mmap.PAGESIZE)
+
+    def test_leave_truncated_files_to_exifread(self) -> None:
+        data = (self.dir / "sample.jpg").read_bytes()
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = Path(tempdir) / "truncated.jpg"
+            path.write_bytes(data[:200])
+
+            with path.open("rb") as f:
+                self.assertIsNone(read_raw_dates(f))
+
+    def test_empty_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = Path(tempdir) / "empty.jpg"
+            path.touch()
+
+            self.assertRaises(NoExifDataException, Picture, path)
@@ -0,0 +1,74 @@
+import datetime
+import unittest
+from pathlib import Path
+
+from pisort.Picture import Picture
+from pisort.PictureIndex import PictureIndex
+
+
+def picture(name: str, day: int | None) -> Picture:
+    date = None if day is None else datetime.datetime(2024, 1, day, tzinfo=datetime.timezone.utc)
+    return Picture.with_date(Path(name), date)
+
+
+class PictureIndexTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.a = picture("a.jpg", 3)
+        self.b = picture("b.jpg", 1)
+        self.c = picture("c.jpg", 3)
+        self.d = picture("d.jpg", None)
+        self.index = PictureIndex([self.d, self.c, self.b, self.a])
+
+    def test_bulk_load_in_chronological_order(self) -> None:
+        self.assertEqual([self.b, self.a, self.c, self.d], list(self.index))
+        self.assertEqual(4, len(self.index))
+
+    def test_position(self) -> None:
+        self.assertEqual(0, self.index.index(self.b))
+        self.assertEqual(2, self.index.index(self.c))
+        self.assertRaises(ValueError, self.index.index, picture("b.jpg", 1))
+
+    def test_insert(self) -> None:
+        e = picture("e.jpg", 2)
+
+        self.assertEqual(1, self.index.insert(e))
+
+        self.assertEqual([self.b, e, self.a, self.c, self.d], list(self.index))
+
+    def test_remove(self) -> None:
+        self.assertEqual(1, self.index.remove(self.a))
+
+        self.assertEqual([self.b, self.c, self.d], list(self.index))
+        self.assertRaises(ValueError, self.index.remove, self.a)
+
+    def test_unchanged(self) -> None:
+        self.assertIsNone(self.index.changed_since(self.index.version))
+
+    def test_lowest_position_changed_since_version(self) -> None:
+        version = self.index.version
+        self.index.insert(picture("e.jpg", 4))
+        self.index.remove(self.a)
+        later = self.index.version
+        self.index.insert(picture("f.jpg", 5))
+
+        self.assertEqual(1, self.index.changed_since(version))
+        self.assertEqual(3, self.index.changed_since(later))
+
+    def test_forget_changes(self) -> None:
+        self.index.remove(self.b)
+        version = self.index.version
+        self.index.remove(self.d)
+
+        self.index.forget(version)
+
+        self.assertEqual(2, self.index.changed_since(version))
+
+    def test_refresh_after_rename(self) -> None:
+        for i, pic in enumerate(self.index):
+            pic.path = Path(f"{i}.jpg")
+
+        self.index.refresh()
+
+        self.assertEqual(2, self.index.index(self.c))
+        self.assertEqual(3, self.index.insert(picture("9.jpg", 3)))
@@ -0,0 +1,85 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from pisort.Stats import Stats, no_stats
+
+src = Path(__file__).parent
+
+
+class StatsTest(unittest.TestCase):
+
+    def test_sum_phases(self) -> None:
+        stats = Stats()
+
+        for _ in range(2):
+            with stats.phase("sleep"):
+                time.sleep(0.01)
+
+        self.assertGreaterEqual(stats.report()["phases"]["sleep"], 0.02)
+
+    def test_time_iteration(self) -> None:
+        stats = Stats()
+
+        def slow():
+            for i in range(2):
+                time.sleep(0.01)
+                yield i
+
+        self.assertEqual([0, 1], list(stats.timed("list", slow())))
+        self.assertGreaterEqual(stats.report()["phases"]["list"], 0.02)
+
+    def test_count(self) -> None:
+        stats = Stats()
+
+        stats.count("renamed", 3)
+        stats.count("renamed")
+
+        self.assertEqual({"renamed": 4}, stats.report()["counters"])
+
+    def test_count_bytes_read(self) -> None:
+        stats = Stats()
+
+        with stats.open(src / "sample.jpg") as f:
+            f.read(100)
+            f.seek(1000)
+            f.read(10)
+
+        self.assertEqual(110, stats.report()["counters"]["bytes read"])
+
+    def test_keep_slowest_files(self) -> None:
+        stats = Stats(slowest=2)
+
+        for name in ["no-date.png", "sample.jpg", "code-screenshot.png"]:
+            with stats.open(src / name):
+                if name != "no-date.png":
+                    time.sleep(0.01)
+
+        self.assertEqual(
+            {str(src / "sample.jpg"), str(src / "code-screenshot.png")},
+            {entry["path"] for entry in stats.report()["slowest"]},
+        )
+
+    def test_write(self) -> None:
+        stats = Stats()
+        stats.count("scanned")
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = Path(tempdir) / "stats.json"
+
+            stats.write(path)
+
+            self.assertEqual({"scanned": 1}, json.loads(path.read_text())["counters"])
+
+    def test_null_stats_record_nothing(self) -> None:
+        with no_stats.phase("sleep"):
+            pass
+        no_stats.count("renamed")
+        with no_stats.open(src / "sample.jpg") as f:
+            f.read(10)
+
+        report = no_stats.report()
+        self.assertEqual({}, report["phases"])
+        self.assertEqual({}, report["counters"])
+        self.assertEqual([], report["slowest"])
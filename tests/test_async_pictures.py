@@ -0,0 +1,109 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pisort.DateCache import DateCache
+from pisort.async_pictures import async_list_pictures, async_sort_pictures
+from pisort.exceptions import PendingJournalException
+from pisort.list_pictures import list_pictures, load_cached_picture
+from pisort.sort_pictures import sort_pictures
+
+src = Path(__file__).parent
+digitized = src / "digitized_2023-08-01T20:00:00-07:00.png"
+modified = src / "modified_2023-08-13T21:47:50+02:00.png"
+no_date = src / "no-date.png"
+original = src / "original_2020-01-01T00:00:00+00:00.png"
+
+
+class AsyncPicturesTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.dst = Path(self.dir.name)
+        for i in range(20):
+            (self.dst / f"digitized{i}.png").hardlink_to(digitized)
+            (self.dst / f"modified{i}.png").hardlink_to(modified)
+            (self.dst / f"original{i}.png").hardlink_to(original)
+        (self.dst / "no-date.png").hardlink_to(no_date)
+        (self.dst / "notes.txt").write_text("Not a picture")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_list_in_same_order_as_sync(self) -> None:
+        expected = [(p.path, p.date()) for p in list_pictures(self.dst)]
+
+        actual = asyncio.run(async_list_pictures(self.dst, jobs=4))
+
+        self.assertEqual(expected, [(p.path, p.date()) for p in actual])
+
+    def test_list_with_cache(self) -> None:
+        cache = DateCache(self.dst / ".cache" / "dates.sqlite3")
+        expected = [(p.path, p.date()) for p in list_pictures(self.dst)]
+
+        asyncio.run(async_list_pictures(self.dst, cache=cache))
+        actual = asyncio.run(async_list_pictures(self.dst, cache=cache))
+
+        self.assertEqual(expected, [(p.path, p.date()) for p in actual])
+        cache.close()
+
+    def test_sort(self) -> None:
+        pictures = asyncio.run(async_list_pictures(self.dst))
+
+        result = asyncio.run(async_sort_pictures(pictures, "Trip", jobs=4))
+
+        self.assertEqual(60, result.renamed)
+        self.assertTrue(original.samefile(self.dst / "00 - Trip.png"))
+        self.assertTrue(digitized.samefile(self.dst / "20 - Trip.png"))
+        self.assertTrue(modified.samefile(self.dst / "59 - Trip.png"))
+        self.assertTrue(all(picture.path.exists() for picture in pictures))
+        self.assertFalse((self.dst / ".pisort-journal").exists())
+
+    def test_same_renames_as_sync(self) -> None:
+        with tempfile.TemporaryDirectory() as other:
+            other = Path(other)
+            for path in self.dst.iterdir():
+                (other / path.name).hardlink_to(path)
+            sort_pictures(list_pictures(other))
+
+            asyncio.run(async_sort_pictures(asyncio.run(async_list_pictures(self.dst))))
+
+            self.assertEqual(sorted(p.name for p in other.iterdir()), sorted(p.name for p in self.dst.iterdir()))
+            for path in other.iterdir():
+                self.assertTrue(path.samefile(self.dst / path.name), path.name)
+
+    def test_do_nothing_on_conflict(self) -> None:
+        pictures = asyncio.run(async_list_pictures(self.dst))
+        (self.dst / "00.png").touch()
+
+        self.assertRaises(FileExistsError, asyncio.run, async_sort_pictures(pictures))
+
+        self.assertTrue(original.samefile(self.dst / "original0.png"))
+
+    def test_refuse_to_sort_after_interruption(self) -> None:
+        pictures = asyncio.run(async_list_pictures(self.dst))
+        (self.dst / ".pisort-journal").touch()
+
+        self.assertRaises(PendingJournalException, asyncio.run, async_sort_pictures(pictures))
+
+    def test_stop_reading_after_failure(self) -> None:
+        calls = []
+        lock = threading.Lock()
+
+        def load(path, *args):
+            with lock:
+                calls.append(path)
+                first = len(calls) == 1
+            if first:
+                raise OSError("Read failed")
+            time.sleep(0.01)
+            return load_cached_picture(path, *args)
+
+        with patch("pisort.async_pictures.load_cached_picture", load):
+            self.assertRaises(OSError, asyncio.run, async_list_pictures(self.dst, jobs=2))
+
+        self.assertLessEqual(len(calls), 8)
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pisort.batch import input_paths, map_ordered, parse_jobs
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_map_in_order(self) -> None:
+        for jobs in [1, 4]:
+            with self.subTest(jobs=jobs):
+                self.assertEqual([i * i for i in range(100)], list(map_ordered(lambda i: i * i, range(100), jobs)))
+
+    def test_bounded_window(self) -> None:
+        consumed = 0
+
+        def items():
+            nonlocal consumed
+            for i in range(1000):
+                consumed += 1
+                yield i
+
+        results = map_ordered(lambda i: i, items(), jobs=2)
+        next(results)
+        results.close()
+
+        # 4 * jobs items in flight, and the first one yielded
+        self.assertEqual(9, consumed)
+
+    def test_input_paths(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as file:
+            file.write("b.jpg\n\nc d.jpg\n")
+            file.flush()
+
+            paths = list(input_paths(["a.jpg"], file.name))
+
+        self.assertEqual([Path("a.jpg"), Path("b.jpg"), Path("c d.jpg")], paths)
+
+    def test_parse_jobs(self) -> None:
+        self.assertEqual(4, parse_jobs("test", "4"))
+        for value in ["0", "-1", "²", "four"]:
+            with self.subTest(value=value), patch("builtins.print"), patch("builtins.exit", side_effect=SystemExit):
+                self.assertRaises(SystemExit, parse_jobs, "test", value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from pisort.Picture import Picture
+from pisort.debug import extract, extract_all, walk
+
+
+class DebugTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.src_dir = Path(__file__).parent
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.work_path = Path(self.work_dir.name)
+
+    def tearDown(self) -> None:
+        self.work_dir.cleanup()
+
+    def test_extract_filters_tags(self) -> None:
+        tags = extract(self.src_dir / "sample.jpg", ["EXIF DateTime*"])
+
+        self.assertEqual("2017:05:29 11:11:16", tags["EXIF DateTimeOriginal"])
+        self.assertTrue(all(name.startswith("EXIF DateTime") for name in tags))
+
+    def test_extract_malformed_date(self) -> None:
+        path = self.work_path / "malformed.jpg"
+        path.write_bytes((self.src_dir / "sample.jpg").read_bytes().replace(b"2017:05:29", b"2017:13:29"))
+
+        tags = extract(path, ["EXIF DateTimeOriginal"])
+
+        self.assertEqual({"EXIF DateTimeOriginal": "2017:13:29 11:11:16"}, tags)
+
+    def test_extract_all_in_order(self) -> None:
+        paths = [
+            self.src_dir / "sample.jpg",
+            self.src_dir / "missing.jpg",
+            self.src_dir / "no-date.png",
+        ] * 10
+
+        results = list(extract_all(paths, ["EXIF DateTimeOriginal"], jobs=4))
+
+        self.assertEqual(paths, [path for path, _ in results])
+        self.assertEqual({"EXIF DateTimeOriginal": "2017:05:29 11:11:16"}, results[0][1])
+        self.assertIsInstance(results[1][1], FileNotFoundError)
+
+    def test_extract_all_is_lazy(self) -> None:
+        consumed = 0
+
+        def paths():
+            nonlocal consumed
+            for _ in range(1000):
+                consumed += 1
+                yield self.src_dir / "sample.jpg"
+
+        results = extract_all(paths(), jobs=2)
+        next(results)
+        results.close()
+
+        self.assertLess(consumed, 20)
+
+    def test_walk(self) -> None:
+        (self.work_path / "b").mkdir()
+        for name in ["b/2.jpg", "b/1.jpg", "a.jpg"]:
+            (self.work_path / name).touch()
+
+        self.assertEqual(
+            [self.work_path / "a.jpg", self.work_path / "b/1.jpg", self.work_path / "b/2.jpg"],
+            list(walk([self.work_path])),
+        )
+
+    def test_print_header_to_file(self) -> None:
+        file = io.StringIO()
+
+        Picture(self.src_dir / "sample.jpg", keep_exif=True).print(file)
+
+        self.assertTrue(file.getvalue().startswith("sample.jpg:\n"))
+
+    def test_json_lines(self) -> None:
+        shutil.copy(self.src_dir / "sample.jpg", self.work_path / "picture.jpg")
+        (self.work_path / "broken.jpg").write_bytes(b"\xff\xd8")
+        environment = dict(os.environ, PYTHONPATH=str(self.src_dir.parent / "src"))
+
+        process = subprocess.run(
+            [sys.executable, "-m", "pisort.debug", "--json", "-j", "2", "-t", "EXIF DateTimeOriginal", "-T", "-"],
+            input=f"{self.work_path / 'broken.jpg'}\n{self.work_path / 'picture.jpg'}\n",
+            capture_output=True,
+            env=environment,
+            text=True,
+        )
+
+        self.assertEqual(1, process.returncode)
+        records = [json.loads(line) for line in process.stdout.splitlines()]
+        self.assertEqual(str(self.work_path / "broken.jpg"), records[0]["path"])
+        self.assertIn("error", records[0])
+        self.assertEqual(
+            {"path": str(self.work_path / "picture.jpg"), "tags": {"EXIF DateTimeOriginal": "2017:05:29 11:11:16"}},
+            records[1],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pisort import dedupe as dedupe_module
+from pisort.Picture import Picture
+from pisort.dedupe import dedupe, find_duplicates
+
+src = Path(__file__).parent
+digitized = src / "digitized_2023-08-01T20:00:00-07:00.png"
+original = src / "original_2020-01-01T00:00:00+00:00.png"
+sample = src / "sample.jpg"
+
+
+class DedupeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.dst = Path(self.dir.name)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def copy(self, source: Path, name: str) -> Picture:
+        shutil.copyfile(source, self.dst / name)
+        return Picture(self.dst / name)
+
+    def test_find_copies(self) -> None:
+        b = self.copy(original, "b.png")
+        a = self.copy(original, "a.png")
+        c = self.copy(digitized, "c.png")
+        d = self.copy(digitized, "d.png")
+        e = self.copy(sample, "e.jpg")
+
+        groups = find_duplicates([b, e, d, a, c])
+
+        self.assertCountEqual([[a, b], [c, d]], groups)
+
+    def test_same_prefix_different_content(self) -> None:
+        data = sample.read_bytes()
+        (self.dst / "a.jpg").write_bytes(data)
+        (self.dst / "b.jpg").write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+        pictures = [Picture(self.dst / "a.jpg"), Picture(self.dst / "b.jpg")]
+
+        self.assertEqual([], find_duplicates(pictures))
+
+    def test_only_read_pictures_with_same_date(self) -> None:
+        pictures = [self.copy(original, "a.png"), self.copy(digitized, "b.png"), self.copy(sample, "c.jpg")]
+
+        with patch.object(dedupe_module, "digest", wraps=dedupe_module.digest) as digest:
+            self.assertEqual([], find_duplicates(pictures))
+
+        digest.assert_not_called()
+
+    def test_hash_whole_file_only_on_prefix_match(self) -> None:
+        data = bytearray(sample.read_bytes())
+        (self.dst / "a.jpg").write_bytes(data)
+        data[dedupe_module.prefix_size - 1] ^= 1
+        (self.dst / "b.jpg").write_bytes(data)
+        pictures = [Picture(self.dst / "a.jpg"), Picture(self.dst / "b.jpg")]
+
+        with patch.object(dedupe_module, "digest", wraps=dedupe_module.digest) as digest:
+            self.assertEqual([], find_duplicates(pictures))
+
+        self.assertEqual([dedupe_module.prefix_size] * 2, [call.args[1] for call in digest.call_args_list])
+
+    def test_leave_duplicates_out(self) -> None:
+        b = self.copy(original, "b.png")
+        c = self.copy(digitized, "c.png")
+        a = self.copy(original, "a.png")
+
+        pictures, duplicates = dedupe([b, c, a])
+
+        self.assertEqual([c, a], pictures)
+        self.assertEqual([(b, a)], duplicates)
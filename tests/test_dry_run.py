@@ -0,0 +1,92 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pisort.Picture import Picture
+from pisort.dry_run import dry_run
+
+src = Path(__file__).parent
+digitized = src / "digitized_2023-08-01T20:00:00-07:00.png"
+original = src / "original_2020-01-01T00:00:00+00:00.png"
+
+
+class DryRunTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.dst = Path(self.dir.name)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "original.png").hardlink_to(original)
+        self.pictures = [Picture(self.dst / name) for name in ["digitized.png", "original.png"]]
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_print_plan(self) -> None:
+        output = io.StringIO()
+
+        conflicts = dry_run(self.pictures, output, "Trip")
+
+        self.assertEqual(0, conflicts)
+        self.assertEqual([
+            {
+                "source": str(self.dst / "original.png"),
+                "target": str(self.dst / "0 - Trip.png"),
+                "date": "2020-01-01T00:00:00+00:00",
+            },
+            {
+                "source": str(self.dst / "digitized.png"),
+                "target": str(self.dst / "1 - Trip.png"),
+                "date": "2023-08-01T20:00:00-07:00",
+            },
+        ], [json.loads(line) for line in output.getvalue().splitlines()])
+
+    def test_do_not_rename(self) -> None:
+        dry_run(self.pictures, io.StringIO())
+
+        self.assertTrue(original.samefile(self.dst / "original.png"))
+        self.assertTrue(digitized.samefile(self.dst / "digitized.png"))
+
+    def test_report_conflicts(self) -> None:
+        (self.dst / "1.png").touch()
+        output = io.StringIO()
+
+        conflicts = dry_run(self.pictures, output)
+
+        self.assertEqual(1, conflicts)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertNotIn("conflict", records[0])
+        self.assertTrue(records[1]["conflict"])
+
+    def test_report_duplicates(self) -> None:
+        output = io.StringIO()
+
+        dry_run(self.pictures[:1], output, duplicates=[(self.pictures[1], self.pictures[0])])
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual({
+            "source": str(self.dst / "original.png"),
+            "target": str(self.dst / "0~dup1.png"),
+            "date": "2020-01-01T00:00:00+00:00",
+            "duplicate_of": str(self.dst / "digitized.png"),
+        }, records[1])
+
+    def test_duplicates_of_numbered_pictures_do_not_conflict(self) -> None:
+        for name in ["0.png", "1.png"]:
+            (self.dst / name).write_bytes(original.read_bytes())
+        (self.dst / "2.png").hardlink_to(digitized)
+        (self.dst / "digitized.png").unlink()
+        (self.dst / "original.png").unlink()
+        pictures = [Picture(self.dst / name) for name in ["0.png", "1.png", "2.png"]]
+        output = io.StringIO()
+
+        conflicts = dry_run([pictures[0], pictures[2]], output, duplicates=[(pictures[1], pictures[0])])
+
+        self.assertEqual(0, conflicts)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(
+            [("2.png", "1.png"), ("1.png", "0~dup1.png")],
+            [(Path(r["source"]).name, Path(r["target"]).name) for r in records[1:]],
+        )
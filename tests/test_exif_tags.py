@@ -0,0 +1,74 @@
+import struct
+import unittest
+import zlib
+from pathlib import Path
+
+from pisort.Picture import Picture, date_tags
+from pisort.exif_tags import TagLocation, find_png_exif, find_tiff_header, locate_tags, read_dates, read_value
+
+src = Path(__file__).parent
+
+
+class ExifTagsTest(unittest.TestCase):
+
+    def test_locate_jpeg_tags(self) -> None:
+        path = src / "sample.jpg"
+        data = path.read_bytes()
+        exif = Picture(path, keep_exif=True).exif
+
+        tags = locate_tags(data, find_tiff_header(data))
+
+        self.assertEqual({"Image DateTime", "EXIF DateTimeOriginal", "EXIF DateTimeDigitized"}, set(tags))
+        for name, location in tags.items():
+            self.assertEqual(exif[name].values, read_value(data, location))
+
+    def test_not_jpeg_nor_tiff(self) -> None:
+        self.assertIsNone(find_tiff_header(b"\x89PNG\r\n\x1a\n"))
+
+    def test_truncated(self) -> None:
+        data = (src / "sample.jpg").read_bytes()
+        tiff = find_tiff_header(data)
+
+        self.assertRaises(EOFError, locate_tags, data[:tiff + 64], tiff)
+
+    def test_inline_value(self) -> None:
+        # Little endian TIFF, with a single IFD0 entry: DateTime "ab"
+        data = b"II*\0\x08\0\0\0" + b"\x01\0" + b"\x32\x01\x02\0\x03\0\0\0ab\0\0" + b"\0\0\0\0"
+
+        tags = locate_tags(data, 0)
+
+        self.assertEqual({"Image DateTime": TagLocation(18, 3)}, tags)
+        self.assertEqual("ab", read_value(data, tags["Image DateTime"]))
+
+    def test_read_same_dates_as_exifread(self) -> None:
+        for path in [src / "sample.jpg", *src.glob("*.png")]:
+            with self.subTest(path.name):
+                exif = Picture(path, keep_exif=True).exif
+                expected = {tag: exif[tag].values for tags in date_tags for tag in tags if tag in exif}
+
+                actual = read_dates(memoryview(path.read_bytes()))
+
+                self.assertEqual(expected, actual)
+
+    def test_same_date_as_exifread(self) -> None:
+        for path in [src / "sample.jpg", *src.glob("*.png")]:
+            with self.subTest(path.name):
+                self.assertEqual(Picture(path, details=True).date(), Picture(path).date())
+
+    def test_png_exif_after_other_chunks(self) -> None:
+        data = (src / "code-screenshot.png").read_bytes()
+
+        self.assertEqual(2788, find_png_exif(data))
+
+    def test_png_without_exif(self) -> None:
+        header = struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)
+        data = b"\x89PNG\r\n\x1a\n" + self.chunk(b"IHDR", header) + self.chunk(b"IEND", b"")
+
+        self.assertIsNone(read_dates(data))
+
+    def test_unrecognized_format(self) -> None:
+        self.assertIsNone(read_dates(b"GIF89a"))
+
+    @staticmethod
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
@@ -0,0 +1,153 @@
+import datetime
+import shutil
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+import piexif
+
+from pisort.Picture import Picture
+from pisort.Stats import Stats
+from pisort.exceptions import NoExifDataException
+from pisort.isobmff import find_item_extents, mac_epoch
+from pisort.list_pictures import list_pictures
+
+src = Path(__file__).parent
+
+
+def box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(payload)) + kind + payload
+
+
+def full_box(kind: bytes, version: int, payload: bytes) -> bytes:
+    return box(kind, bytes([version, 0, 0, 0]) + payload)
+
+
+def mvhd(date: datetime.datetime, version: int = 0) -> bytes:
+    seconds = int((date - mac_epoch).total_seconds())
+    if version == 1:
+        return full_box(b"mvhd", 1, struct.pack(">QQIQ", seconds, seconds, 1000, 0))
+    return full_box(b"mvhd", 0, struct.pack(">IIII", seconds, seconds, 1000, 0))
+
+
+def heic(exif: bytes) -> bytes:
+    """
+    :return: a HEIC file with an image item, and an Exif item made of
+      the given "Exif\\0\\0" APP1 payload.
+    """
+    item = struct.pack(">I", 6) + exif
+    iinf = full_box(b"iinf", 0, struct.pack(">H", 2) + b"".join([
+        full_box(b"infe", 2, struct.pack(">HH4s", 1, 0, b"hvc1") + b"\0"),
+        full_box(b"infe", 2, struct.pack(">HH4s", 2, 0, b"Exif") + b"\0"),
+    ]))
+    ftyp = box(b"ftyp", b"heic" + bytes(4) + b"mif1heic")
+
+    def iloc(mdat: int) -> bytes:
+        return full_box(b"iloc", 0, bytes([0x44, 0x00]) + struct.pack(">H", 2) + b"".join([
+            struct.pack(">HHHII", 1, 0, 1, mdat + 8 + len(item), 16),
+            struct.pack(">HHHII", 2, 0, 1, mdat + 8, len(item)),
+        ]))
+
+    meta_size = len(full_box(b"meta", 0, iinf + iloc(0)))
+    meta = full_box(b"meta", 0, iinf + iloc(len(ftyp) + meta_size))
+    return ftyp + meta + box(b"mdat", item + bytes(16))
+
+
+class IsobmffTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.work_path = Path(self.work_dir.name)
+        self.date = datetime.datetime(2024, 7, 14, 21, 30, tzinfo=datetime.timezone.utc)
+
+    def tearDown(self) -> None:
+        self.work_dir.cleanup()
+
+    def test_video_date(self) -> None:
+        path = self.work_path / "video.mp4"
+        path.write_bytes(
+            box(b"ftyp", b"isom" + bytes(4) + b"isomiso2mp41")
+            + box(b"moov", mvhd(self.date) + box(b"trak", bytes(64)))
+            + box(b"mdat", bytes(256))
+        )
+
+        self.assertEqual(self.date, Picture(path).date())
+
+    def test_video_date_version_1(self) -> None:
+        path = self.work_path / "video.mov"
+        path.write_bytes(box(b"ftyp", b"qt  " + bytes(4) + b"qt  ") + box(b"moov", mvhd(self.date, 1)))
+
+        self.assertEqual(self.date, Picture(path).date())
+
+    def test_large_video_reads_headers_only(self) -> None:
+        path = self.work_path / "video.mp4"
+        media_size = 256 * 1024 * 1024
+        with path.open("wb") as f:
+            f.write(box(b"ftyp", b"isom" + bytes(4) + b"isom"))
+            # 64 bits box size
+            f.write(struct.pack(">I4sQ", 1, b"mdat", 16 + media_size))
+            f.seek(media_size, 1)
+            f.write(box(b"moov", box(b"udta", bytes(4096)) + mvhd(self.date)))
+        stats = Stats()
+
+        date = Picture(path, stats=stats).date()
+
+        self.assertEqual(self.date, date)
+        self.assertLess(stats.counters["bytes read"], 1024)
+
+    def test_video_without_date(self) -> None:
+        path = self.work_path / "video.mp4"
+        path.write_bytes(box(b"ftyp", b"isom" + bytes(4)) + box(b"moov", full_box(b"mvhd", 0, bytes(16))))
+
+        self.assertRaises(NoExifDataException, Picture, path)
+
+    def test_truncated_video(self) -> None:
+        path = self.work_path / "video.mp4"
+        path.write_bytes((box(b"ftyp", b"isom" + bytes(4)) + box(b"moov", mvhd(self.date)))[:-20])
+
+        self.assertRaises(NoExifDataException, Picture, path)
+
+    def test_heic_date(self) -> None:
+        path = self.work_path / "picture.heic"
+        exif = piexif.dump({"Exif": {
+            piexif.ExifIFD.DateTimeOriginal: "2024:07:14 23:30:00",
+            piexif.ExifIFD.OffsetTimeOriginal: "+02:00",
+        }})
+        path.write_bytes(heic(exif))
+
+        self.assertEqual(self.date, Picture(path).date())
+        tags = Picture(path, keep_exif=True).exif
+        self.assertEqual("2024:07:14 23:30:00", tags["EXIF DateTimeOriginal"].values)
+
+    def test_heic_without_exif(self) -> None:
+        path = self.work_path / "picture.heic"
+        path.write_bytes(box(b"ftyp", b"heic" + bytes(4)) + full_box(b"meta", 0, b""))
+
+        self.assertRaises(NoExifDataException, Picture, path)
+
+    def test_item_extents_version_1(self) -> None:
+        # Base offset and extent index of 4 bytes, two extents
+        iloc = bytes([1, 0, 0, 0, 0x44, 0x44]) + struct.pack(">H", 1) + struct.pack(
+            ">HHHIH" + "III" * 2,
+            7, 0, 0, 1000, 2,
+            0, 10, 20,
+            1, 50, 30,
+        )
+
+        self.assertEqual([(1010, 20), (1050, 30)], find_item_extents(iloc, 7))
+        self.assertIsNone(find_item_extents(iloc, 8))
+
+    def test_list_videos_with_pictures(self) -> None:
+        shutil.copy(src / "sample.jpg", self.work_path / "picture.jpg")
+        (self.work_path / "video.mp4").write_bytes(
+            box(b"ftyp", b"isom" + bytes(4)) + box(b"moov", mvhd(mac_epoch + datetime.timedelta(days=365 * 100)))
+        )
+
+        pictures = list_pictures(self.work_path)
+
+        self.assertEqual({"picture.jpg", "video.mp4"}, {picture.path.name for picture in pictures})
+
+
+if __name__ == '__main__':
+    unittest.main()
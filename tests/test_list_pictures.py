@@ -1,8 +1,10 @@
+import datetime
 import tempfile
 import unittest
 from pathlib import Path
 
-from pisort.list_pictures import list_pictures
+from pisort.DateCache import DateCache
+from pisort.list_pictures import iter_pictures, list_pictures
 
 src = Path(__file__).parent
 
@@ -39,3 +41,45 @@ class ListPicturesTest(unittest.TestCase):
 
             paths = {pic.path for pic in actual}
             self.assertNotIn(subdir, paths)
+
+    def test_jobs_give_same_result(self):
+        expected = list_pictures(src)
+
+        actual = list_pictures(src, jobs=4)
+
+        self.assertEqual([pic.path for pic in expected], [pic.path for pic in actual])
+
+    def test_fill_cache(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cache = DateCache(Path(tempdir) / "dates.sqlite3")
+            expected = list_pictures(src)
+
+            actual = list_pictures(src, cache=cache)
+
+            self.assertEqual([pic.path for pic in expected], [pic.path for pic in actual])
+            self.assertEqual(
+                expected[0].date(),
+                cache.get(expected[0].path, expected[0].path.stat()),
+            )
+            self.assertIsNone(cache.get(src / "no-date.png", (src / "no-date.png").stat()))
+            cache.close()
+
+    def test_use_cache(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cache = DateCache(Path(tempdir) / "dates.sqlite3")
+            original = src / "original_2020-01-01T00:00:00+00:00.png"
+            date = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+            cache.put(original, original.stat(), date)
+
+            actual = list_pictures(src, cache=cache)
+
+            dates = {pic.path: pic.date() for pic in actual}
+            self.assertEqual(date, dates[original])
+            cache.close()
+
+    def test_iter_pictures_in_directory_order(self):
+        expected = list_pictures(src)
+
+        actual = iter_pictures(src, jobs=2)
+
+        self.assertEqual([pic.path for pic in expected], [pic.path for pic in actual])
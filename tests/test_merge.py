@@ -0,0 +1,162 @@
+import datetime
+import errno
+import io
+import json
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pisort import list_pictures
+from pisort.exceptions import MergeException
+from pisort.isobmff import mac_epoch
+from pisort.merge import dry_run_merge, merge
+
+start = datetime.datetime(2024, 7, 14, tzinfo=datetime.timezone.utc)
+
+
+def make_video(path: Path, day: int) -> None:
+    """
+    Write a minimal MP4 file, created `day` days after `start`.
+    """
+    seconds = int((start + datetime.timedelta(days=day) - mac_epoch).total_seconds())
+    mvhd = struct.pack(">I4sIIIII", 28, b"mvhd", 0, seconds, seconds, 1000, 0)
+    path.write_bytes(
+        struct.pack(">I4s8s", 16, b"ftyp", b"isom\0\0\0\0")
+        + struct.pack(">I4s", 8 + len(mvhd), b"moov") + mvhd
+    )
+
+
+class MergeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.dir.name)
+        self.target = self.root / "album"
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def make_folder(self, name: str, days: list[int], names: list[str] = None) -> Path:
+        folder = self.root / name
+        folder.mkdir()
+        for i, day in enumerate(days):
+            make_video(folder / f"{i}{names[i] if names else ''}.mp4", day)
+        return folder
+
+    def test_concatenate_folders(self) -> None:
+        late = self.make_folder("late", [10, 11, 12, 13, 14, 15])
+        early = self.make_folder("early", [0, 1, 2, 3, 4])
+
+        with patch("pisort.merge.load_cached_picture", wraps=list_pictures.load_cached_picture) as load:
+            result = merge([late, early], self.target)
+
+        self.assertEqual(11, result.renamed)
+        self.assertEqual(4, load.call_count)
+        self.assertEqual([f"{i:02}.mp4" for i in range(11)], sorted(p.name for p in self.target.iterdir()))
+        self.assertEqual([], list(late.iterdir()) + list(early.iterdir()))
+        self.assertEqual(
+            [start + datetime.timedelta(days=day) for day in [0, 1, 2, 3, 4, 10, 11, 12, 13, 14, 15]],
+            [p.date() for p in sorted(list_pictures.list_pictures(self.target), key=lambda p: p.path.name)],
+        )
+
+    def test_merge_overlapping_folders(self) -> None:
+        a = self.make_folder("a", [0, 2, 4], [" - Beach", "", " - Beach"])
+        b = self.make_folder("b", [1, 2, 5])
+        c = self.make_folder("c", [8, 9])
+
+        merge([a, b, c], self.target, "Trip")
+
+        self.assertEqual([
+            "0 - Beach.mp4",
+            "1 - Trip.mp4",
+            "2 - Trip.mp4",
+            "3 - Trip.mp4",
+            "4 - Beach.mp4",
+            "5 - Trip.mp4",
+            "6 - Trip.mp4",
+            "7 - Trip.mp4",
+        ], sorted(p.name for p in self.target.iterdir()))
+        days = {p.path.name: (p.date() - start).days for p in list_pictures.list_pictures(self.target)}
+        self.assertEqual([0, 1, 2, 2, 4, 5, 8, 9], [days[name] for name in sorted(days)])
+
+    def test_ignore_unsorted_files(self) -> None:
+        a = self.make_folder("a", [0, 1])
+        make_video(a / "unsorted.mp4", 3)
+
+        merge([a], self.target)
+
+        self.assertEqual(["0.mp4", "1.mp4"], sorted(p.name for p in self.target.iterdir()))
+        self.assertTrue((a / "unsorted.mp4").exists())
+
+    def test_refuse_to_overwrite(self) -> None:
+        a = self.make_folder("a", [0, 1])
+        self.target.mkdir()
+        (self.target / "1 - Old.jpg").touch()
+
+        self.assertRaises(FileExistsError, merge, [a], self.target)
+
+        self.assertEqual(["0.mp4", "1.mp4"], sorted(p.name for p in a.iterdir()))
+
+    def test_report_files_moved_before_error(self) -> None:
+        a = self.make_folder("a", [0, 1, 2])
+        rename = os.rename
+
+        def fail_second(source, target) -> None:
+            if Path(target).name == "1.mp4":
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            rename(source, target)
+
+        with patch("pisort.merge.os.rename", fail_second):
+            with self.assertRaises(MergeException) as context:
+                merge([a], self.target)
+
+        self.assertEqual(1, context.exception.moved)
+        self.assertEqual(errno.EXDEV, context.exception.error.errno)
+        self.assertEqual(["0.mp4"], [p.name for p in self.target.iterdir()])
+        self.assertEqual(["1.mp4", "2.mp4"], sorted(p.name for p in a.iterdir()))
+
+    def test_refuse_to_merge_into_source(self) -> None:
+        a = self.make_folder("a", [0, 1])
+
+        self.assertRaises(ValueError, merge, [a], a)
+
+    def test_dry_run(self) -> None:
+        a = self.make_folder("a", [1])
+        b = self.make_folder("b", [0])
+        self.target.mkdir()
+        (self.target / "1.mp4").touch()
+        output = io.StringIO()
+
+        conflicts = dry_run_merge([a, b], self.target, output)
+
+        self.assertEqual(1, conflicts)
+        self.assertEqual([
+            {"source": str(b / "0.mp4"), "target": str(self.target / "0.mp4"), "date": start.isoformat()},
+            {
+                "source": str(a / "0.mp4"),
+                "target": str(self.target / "1.mp4"),
+                "date": (start + datetime.timedelta(days=1)).isoformat(),
+                "conflict": True,
+            },
+        ], [json.loads(line) for line in output.getvalue().splitlines()])
+        self.assertTrue((a / "0.mp4").exists())
+
+    def test_dry_run_conflicts_with_any_numbered_file(self) -> None:
+        a = self.make_folder("a", [0, 1])
+        self.target.mkdir()
+        (self.target / "1 - Old.png").touch()
+        output = io.StringIO()
+
+        conflicts = dry_run_merge([a], self.target, output)
+
+        self.assertEqual(1, conflicts)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([False, True], [record.get("conflict", False) for record in records])
+        self.assertRaises(FileExistsError, merge, [a], self.target)
+
+
+if __name__ == '__main__':
+    unittest.main()
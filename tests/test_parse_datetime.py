@@ -0,0 +1,55 @@
+import datetime
+import unittest
+
+from pisort.parse_datetime import exif_datetime_format, parse_exif_datetime
+
+
+class ParseDatetimeTest(unittest.TestCase):
+
+    def assertSameAsStrptime(self, string: str) -> None:
+        try:
+            expected = datetime.datetime.strptime(string, exif_datetime_format)
+        except ValueError:
+            with self.assertRaises(ValueError, msg=string):
+                parse_exif_datetime(string)
+            return
+        self.assertEqual(expected, parse_exif_datetime(string), string)
+
+    def test_parse(self) -> None:
+        self.assertEqual(
+            datetime.datetime(2017, 5, 29, 11, 11, 16),
+            parse_exif_datetime("2017:05:29 11:11:16"),
+        )
+
+    def test_same_as_strptime(self) -> None:
+        date = datetime.datetime(1999, 12, 31, 23, 59, 59)
+        for days in range(0, 3000, 7):
+            self.assertSameAsStrptime((date + datetime.timedelta(days=days, seconds=days * 37)).strftime(exif_datetime_format))
+
+    def test_lenient_like_strptime(self) -> None:
+        for string in [
+            "2017:5:29 11:11:16",
+            "2017:05:29 1:1:6",
+            "0001:01:01 00:00:00",
+        ]:
+            self.assertSameAsStrptime(string)
+
+    def test_invalid_like_strptime(self) -> None:
+        for string in [
+            "",
+            "    :  :     :  :  ",  # Unknown date, as specified in Exif 3.0
+            "0000:00:00 00:00:00",
+            "2017:02:30 11:11:16",
+            "2017:05:29 24:00:00",
+            "2017:05:29 11:11:60",
+            "2017:05:29 11:11:16\0",
+            "2017-05-29 11:11:16",
+            "2017:05:29T11:11:16",
+            "２０１７:05:29 11:11:16",
+            "+017:05:29 11:11:16",
+        ]:
+            self.assertSameAsStrptime(string)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import datetime
 import unittest
 
-from pisort.parse_offset import parse_offset
+from pisort.parse_offset import local_timezone, parse_offset
 
 
 class ParseOffsetTest(unittest.TestCase):
@@ -34,3 +34,18 @@ class ParseOffsetTest(unittest.TestCase):
         tz = parse_offset("   :  ")  # Unknown offset, as specified in Exif 3.0
 
         self.assertEqual(now.utcoffset(), tz.utcoffset(now))
+
+    def test_intern(self) -> None:
+        self.assertIs(parse_offset("+02:00"), parse_offset("+02:00"))
+
+    def test_same_as_uncached(self) -> None:
+        for string in ["+00:00", "+05:45", "-09:30", "+14:00"]:
+            tz = parse_offset(string)
+            expected = parse_offset.__wrapped__(string)
+
+            self.assertEqual(expected, tz)
+            self.assertEqual(expected.tzname(None), tz.tzname(None))
+
+    def test_blank_is_local_timezone(self) -> None:
+        self.assertIs(local_timezone(), parse_offset("   :  "))
+        self.assertIs(local_timezone(), parse_offset(""))
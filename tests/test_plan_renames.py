@@ -0,0 +1,66 @@
+import unittest
+
+from pisort.Journal import Rename
+from pisort.plan_renames import plan_renames
+
+
+def apply(files: dict[str, str], sequences: list[list[Rename]]) -> dict[str, str]:
+    files = dict(files)
+    for sequence in sequences:
+        for rename in sequence:
+            if rename.target in files:
+                raise FileExistsError(rename.target)
+            files[rename.target] = files.pop(rename.source)
+    return files
+
+
+class PlanRenamesTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.inodes = {name: i for i, name in enumerate("abcdefgh")}
+
+    def test_skip_fixed_points(self) -> None:
+        actual = plan_renames({"a": "a", "b": "b"}, self.inodes)
+
+        self.assertEqual([], actual)
+
+    def test_append(self) -> None:
+        actual = plan_renames({"a": "a", "b": "b", "h": "c"}, self.inodes)
+
+        self.assertEqual([[Rename("h", "c", self.inodes["h"])]], actual)
+
+    def test_chain_starts_from_the_end(self) -> None:
+        actual = plan_renames({"a": "b", "b": "c", "c": "d"}, self.inodes)
+
+        self.assertEqual([[
+            Rename("c", "d", self.inodes["c"]),
+            Rename("b", "c", self.inodes["b"]),
+            Rename("a", "b", self.inodes["a"]),
+        ]], actual)
+
+    def test_one_temporary_name_per_cycle(self) -> None:
+        moves = {"a": "b", "b": "c", "c": "a", "d": "e", "e": "d"}
+
+        actual = plan_renames(moves, self.inodes)
+
+        self.assertEqual([4, 3], [len(sequence) for sequence in actual])
+        self.assertEqual(
+            {target: source for source, target in moves.items()},
+            apply({name: name for name in moves}, actual),
+        )
+
+    def test_keep_suffix_of_temporary_names(self) -> None:
+        actual = plan_renames({"a.jpg": "b.jpg", "b.jpg": "a.jpg"}, {"a.jpg": 0, "b.jpg": 1})
+
+        self.assertTrue(actual[0][0].target.endswith(".jpg"))
+
+    def test_mixed(self) -> None:
+        moves = {"a": "b", "b": "c", "c": "a", "d": "d", "e": "f", "f": "g", "h": "e"}
+
+        actual = plan_renames(moves, self.inodes)
+
+        self.assertEqual(
+            {target: source for source, target in moves.items()},
+            apply({name: name for name in moves}, actual),
+        )
+        self.assertEqual(7, sum(len(sequence) for sequence in actual))
@@ -6,8 +6,10 @@ import unittest
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+import piexif
+
 from pisort.Picture import Picture
-from pisort.set_datetime import process
+from pisort.set_datetime import Outcome, process, process_all
 
 
 class SetDatetimeTest(unittest.TestCase):
@@ -31,3 +33,91 @@ class SetDatetimeTest(unittest.TestCase):
         actual = Picture(path).date()
         self.assertEqual(expected.timestamp(), actual.timestamp())
         self.assertEqual(datetime.timedelta(hours=2), actual.tzinfo.utcoffset(actual))
+
+    def test_skip_files_with_date(self) -> None:
+        path = Path(self.work_dir.name) / "picture.jpg"
+        shutil.copy(self.src_dir / "sample.jpg", path)
+
+        result = process(path, False)
+
+        self.assertEqual(Outcome.SKIPPED, result.outcome)
+        self.assertEqual(path.stat().st_size, result.size)
+        self.assertEqual(
+            (self.src_dir / "sample.jpg").read_bytes(),
+            path.read_bytes(),
+        )
+
+    def test_report_failure(self) -> None:
+        path = Path(self.work_dir.name) / "picture.jpg"
+        path.write_bytes(b"not a picture")
+
+        result = process(path, True)
+
+        self.assertEqual(Outcome.FAILED, result.outcome)
+
+    def test_report_truncated_jpeg(self) -> None:
+        truncated = Path(self.work_dir.name) / "truncated.jpg"
+        truncated.write_bytes(b"\xff\xd8")
+        path = Path(self.work_dir.name) / "picture.jpg"
+        shutil.copy(self.src_dir / "sample.jpg", path)
+
+        results = list(process_all([truncated, path], True, jobs=2))
+
+        self.assertEqual([Outcome.FAILED, Outcome.WRITTEN], [result.outcome for result in results])
+
+    def test_leave_no_temporary_file(self) -> None:
+        path = Path(self.work_dir.name) / "picture.jpg"
+        shutil.copy(self.src_dir / "sample.jpg", path)
+
+        process(path, True)
+
+        self.assertEqual([path], list(Path(self.work_dir.name).iterdir()))
+
+    def test_write_through_symlink(self) -> None:
+        real = Path(self.work_dir.name) / "real.jpg"
+        shutil.copy(self.src_dir / "sample.jpg", real)
+        piexif.remove(str(real))
+        link = Path(self.work_dir.name) / "link.jpg"
+        link.symlink_to(real.name)
+
+        result = process(link, False)
+
+        self.assertEqual(Outcome.WRITTEN, result.outcome)
+        self.assertTrue(link.is_symlink())
+        self.assertIsNotNone(Picture(real).date())
+
+    def test_process_all_in_order(self) -> None:
+        paths = []
+        for i in range(10):
+            path = Path(self.work_dir.name) / f"{i}.jpg"
+            shutil.copy(self.src_dir / "sample.jpg", path)
+            paths.append(path)
+        (Path(self.work_dir.name) / "5.jpg").write_bytes(b"not a picture")
+
+        results = list(process_all(paths, True, jobs=3))
+
+        self.assertEqual(
+            [Outcome.WRITTEN] * 5 + [Outcome.FAILED] + [Outcome.WRITTEN] * 4,
+            [result.outcome for result in results],
+        )
+
+    def test_overwrite_in_place(self) -> None:
+        path = Path(self.work_dir.name) / "picture.jpg"
+        shutil.copy(self.src_dir / "sample.jpg", path)
+        process(path, True)
+        before = path.read_bytes()
+        expected = datetime.datetime.strptime("2024-02-29 23:59", "%Y-%m-%d %H:%M")
+        expected = expected.replace(tzinfo=ZoneInfo("Europe/Paris"))
+        os.utime(path, (expected.timestamp(), expected.timestamp()))
+        inode = path.stat().st_ino
+
+        result = process(path, True)
+
+        after = path.read_bytes()
+        self.assertEqual(Outcome.WRITTEN, result.outcome)
+        self.assertEqual(inode, path.stat().st_ino)
+        self.assertEqual(len(before), len(after))
+        self.assertLessEqual(sum(1 for a, b in zip(before, after) if a != b), 27)
+        actual = Picture(path).date()
+        self.assertEqual(expected.timestamp(), actual.timestamp())
+        self.assertEqual(datetime.timedelta(hours=1), actual.tzinfo.utcoffset(actual))
@@ -1,9 +1,16 @@
+import datetime
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from pisort.DateCache import DateCache
 from pisort.Picture import Picture
-from pisort.sort_pictures import sort_pictures
+from pisort.dedupe import dedupe
+from pisort.exceptions import PendingJournalException
+from pisort.list_pictures import list_pictures
+from pisort.sort_pictures import find_conflicts, plan_sort, sort_pictures
 
 src = Path(__file__).parent
 digitized = src / "digitized_2023-08-01T20:00:00-07:00.png"
@@ -155,6 +162,107 @@ class SortPicturesTest(unittest.TestCase):
         self.assertSameFile(original, "original.png")
         self.assertSameFile(digitized, "digitized.png")
 
+    def test_do_nothing_when_would_overwrite_dangling_symlink(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "1.png").symlink_to(self.dst / "missing.png")
+        pictures = [Picture(self.dst / name) for name in ["original.png", "digitized.png"]]
+
+        self.assertRaises(FileExistsError, sort_pictures, pictures)
+
+        self.assertSameFile(digitized, "digitized.png")
+
+    def test_check_conflicts_without_stat_per_picture(self) -> None:
+        for i in range(10):
+            (self.dst / f"picture{i}.png").hardlink_to(original)
+        (self.dst / "notes.txt").touch()
+        pictures = [Picture(self.dst / f"picture{i}.png") for i in range(10)]
+
+        with patch("os.path.lexists", wraps=os.path.lexists) as lexists:
+            sort_pictures(pictures)
+
+        lexists.assert_not_called()
+        self.assertSameFile(original, "9.png")
+
+    def test_ignore_conflicts_removed_since_listing(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        pictures = [Picture(self.dst / name) for name in ["original.png", "digitized.png"]]
+        names = {"original.png", "digitized.png", "1.png"}
+
+        conflicts = [conflict for _, _, conflict in find_conflicts(plan_sort(pictures), names)]
+
+        self.assertEqual([False, False], conflicts)
+
+    def test_return_renamed_count(self) -> None:
+        (self.dst / "0.png").hardlink_to(original)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        pictures = [Picture(self.dst / name) for name in ["0.png", "digitized.png"]]
+
+        actual = sort_pictures(pictures)
+
+        self.assertEqual(1, actual.renamed)
+        self.assertEqual(1, actual.operations)
+
+    def test_refuse_to_sort_after_interruption(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / ".pisort-journal").touch()
+
+        self.assertRaises(PendingJournalException, sort_pictures, [Picture(self.dst / "original.png")])
+
+        self.assertSameFile(original, "original.png")
+
+    def test_remove_journal(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+
+        sort_pictures([Picture(self.dst / "original.png")])
+
+        self.assertFalse((self.dst / ".pisort-journal").exists())
+
+    def test_sort_stream(self) -> None:
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "original.png").hardlink_to(original)
+
+        sort_pictures(Picture(self.dst / name) for name in ["digitized.png", "original.png"])
+
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(digitized, "1.png")
+
+    def test_update_cache(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        pictures = [Picture(self.dst / name) for name in ["original.png", "digitized.png"]]
+        cache = DateCache(self.dst / "cache" / "dates.sqlite3")
+        for picture in pictures:
+            cache.put(picture.path, picture.path.stat(), picture.date())
+
+        sort_pictures(pictures, cache=cache)
+
+        new_path = self.dst / "0.png"
+        self.assertEqual(
+            datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+            cache.get(new_path, new_path.stat()),
+        )
+        cache.close()
+
+    def test_dedupe_sorted_folder(self) -> None:
+        (self.dst / "copy.png").write_bytes(original.read_bytes())
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "original.png").hardlink_to(original)
+        sort_pictures(list_pictures(self.dst))
+
+        pictures, duplicates = dedupe(list_pictures(self.dst))
+        result = sort_pictures(pictures, duplicates=duplicates)
+
+        self.assertEqual(2, result.renamed)
+        self.assertEqual([("0~dup1.png", "0.png")], [(d.path.name, o.path.name) for d, o in duplicates])
+        self.assertSameFile(original, "0~dup1.png")
+        self.assertSameFile(digitized, "1.png")
+        self.assertEqual(original.read_bytes(), (self.dst / "0.png").read_bytes())
+
+        pictures, duplicates = dedupe(list_pictures(self.dst))
+        self.assertEqual(0, sort_pictures(pictures, duplicates=duplicates).renamed)
+
     def test_pad_numer_with_zeros(self) -> None:
         pictures = self.mk_samples(25)
 
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from pisort.sort_tree import list_folders, sort_tree
+
+src = Path(__file__).parent
+digitized = src / "digitized_2023-08-01T20:00:00-07:00.png"
+original = src / "original_2020-01-01T00:00:00+00:00.png"
+
+
+class SortTreeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.dir.name)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_list_folders(self) -> None:
+        (self.root / "2023" / "08").mkdir(parents=True)
+        (self.root / "2023" / "07").mkdir(parents=True)
+        (self.root / ".hidden").mkdir()
+
+        actual = list(list_folders([self.root]))
+
+        self.assertEqual([
+            self.root,
+            self.root / "2023",
+            self.root / "2023" / "07",
+            self.root / "2023" / "08",
+        ], actual)
+
+    def test_sort_each_folder(self) -> None:
+        for folder in ["a", "b"]:
+            (self.root / folder).mkdir()
+            (self.root / folder / "digitized.png").hardlink_to(digitized)
+            (self.root / folder / "original.png").hardlink_to(original)
+
+        reports = list(sort_tree([self.root], jobs=2))
+
+        self.assertEqual([(self.root, 0, 0), (self.root / "a", 2, 2), (self.root / "b", 2, 2)],
+                         [(r.directory, r.pictures, r.renamed) for r in reports])
+        for folder in ["a", "b"]:
+            self.assertTrue(original.samefile(self.root / folder / "0.png"))
+            self.assertTrue(digitized.samefile(self.root / folder / "1.png"))
+
+    def test_report_failure_and_continue(self) -> None:
+        for folder in ["a", "b"]:
+            (self.root / folder).mkdir()
+            (self.root / folder / "digitized.png").hardlink_to(digitized)
+            (self.root / folder / "original.png").hardlink_to(original)
+        (self.root / "a" / "1.png").mkdir()
+
+        reports = list(sort_tree([self.root / "a", self.root / "b"]))
+
+        self.assertIsInstance(reports[0].error, FileExistsError)
+        self.assertIsNone(reports[1].error)
+        self.assertTrue(original.samefile(self.root / "b" / "0.png"))
+
+    def test_leave_duplicates_out(self) -> None:
+        (self.root / "digitized.png").hardlink_to(digitized)
+        (self.root / "original.png").hardlink_to(original)
+        (self.root / "copy.png").write_bytes(original.read_bytes())
+
+        [report] = sort_tree([self.root], dedupe=True)
+
+        self.assertEqual((2, 3), (report.pictures, report.renamed))
+        self.assertEqual([("0~dup1.png", "0.png")], [(d.path.name, o.path.name) for d, o in report.duplicates])
+        self.assertEqual(original.read_bytes(), (self.root / "0.png").read_bytes())
+        self.assertTrue(original.samefile(self.root / "0~dup1.png"))
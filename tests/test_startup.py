@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import pisort
+
+heavy_modules = ["exifread", "piexif", "tzlocal", "sqlite3", "concurrent.futures"]
+
+
+def imported_modules(module: str) -> set[str]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", module, "--help"],
+        env=os.environ | {"PYTHONPATH": str(Path(pisort.__path__[0]).parent)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return {line.split("|")[-1].strip() for line in process.stderr.splitlines()}
+
+
+class StartupTest(unittest.TestCase):
+
+    def test_pisort_help_is_lightweight(self) -> None:
+        modules = imported_modules("pisort.pisort")
+
+        for module in heavy_modules:
+            self.assertNotIn(module, modules)
+
+    def test_set_datetime_help_is_lightweight(self) -> None:
+        modules = imported_modules("pisort.set_datetime")
+
+        for module in heavy_modules:
+            self.assertNotIn(module, modules)
@@ -0,0 +1,187 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pisort.list_pictures import load_picture
+from pisort.watch import Inotify, WatchedFolder, watch
+
+src = Path(__file__).parent
+digitized = src / "digitized_2023-08-01T20:00:00-07:00.png"
+modified = src / "modified_2023-08-13T21:47:50+02:00.png"
+no_date = src / "no-date.png"
+original = src / "original_2020-01-01T00:00:00+00:00.png"
+
+
+def inotify_available() -> bool:
+    try:
+        Inotify().close()
+        return True
+    except OSError:
+        return False
+
+
+class WatchedFolderTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.dst = Path(self.dir.name)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_sort_at_start(self) -> None:
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "original.png").hardlink_to(original)
+        folder = WatchedFolder(self.dst)
+
+        report = folder.process()
+
+        self.assertEqual((2, 2, 2), (report.pictures, report.renamed, report.operations))
+        self.assertIsNone(report.error)
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(digitized, "1.png")
+
+    def test_ignore_own_renames(self) -> None:
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "original.png").hardlink_to(original)
+        folder = WatchedFolder(self.dst)
+        folder.process()
+
+        with patch("pisort.list_pictures.load_picture", wraps=load_picture) as load:
+            self.assertIsNone(folder.process())
+            self.assertIsNone(folder.process(["digitized.png", "original.png", "0.png", "1.png"]))
+
+        load.assert_not_called()
+
+    def test_read_only_new_files(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / "notes.txt").touch()
+        folder = WatchedFolder(self.dst)
+        folder.process()
+        (self.dst / "digitized.png").hardlink_to(digitized)
+
+        with patch("pisort.list_pictures.load_picture", wraps=load_picture) as load:
+            report = folder.process(["digitized.png"])
+
+        load.assert_called_once_with(self.dst / "digitized.png", folder.stats)
+        self.assertEqual((2, 1, 1), (report.pictures, report.renamed, report.operations))
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(digitized, "1.png")
+
+    def test_rename_only_shifted_suffix(self) -> None:
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "modified.png").hardlink_to(modified)
+        (self.dst / "no-date.png").hardlink_to(no_date)
+        folder = WatchedFolder(self.dst)
+        folder.process()
+        (self.dst / "original.png").hardlink_to(original)
+
+        report = folder.process()
+
+        self.assertEqual((3, 3, 3), (report.pictures, report.renamed, report.operations))
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(digitized, "1.png")
+        self.assertSameFile(modified, "2.png")
+        self.assertSameFile(no_date, "no-date.png")
+
+    def test_removed_picture(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "modified.png").hardlink_to(modified)
+        folder = WatchedFolder(self.dst)
+        folder.process()
+        (self.dst / "1.png").unlink()
+
+        report = folder.process(["1.png"])
+
+        self.assertEqual((2, 1, 1), (report.pictures, report.renamed, report.operations))
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(modified, "1.png")
+
+    def test_rename_all_when_index_width_changes(self) -> None:
+        for i in range(10):
+            (self.dst / f"picture{i}.png").hardlink_to(digitized)
+        folder = WatchedFolder(self.dst)
+        folder.process()
+        (self.dst / "original.png").hardlink_to(original)
+
+        report = folder.process(["original.png"])
+
+        self.assertEqual(11, report.renamed)
+        self.assertSameFile(original, "00.png")
+        self.assertSameFile(digitized, "10.png")
+
+    def test_follow_symlinks(self) -> None:
+        (self.dst / "original.png").symlink_to(original)
+        folder = WatchedFolder(self.dst)
+        folder.process()
+        (self.dst / "digitized.png").hardlink_to(digitized)
+
+        report = folder.process(["original.png", "0.png", "digitized.png"])
+
+        self.assertEqual((2, 1, 1, None), (report.pictures, report.renamed, report.operations, report.error))
+        self.assertTrue((self.dst / "0.png").is_symlink())
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(digitized, "1.png")
+
+    def test_sort_hidden_files(self) -> None:
+        (self.dst / ".original.png").hardlink_to(original)
+        folder = WatchedFolder(self.dst)
+        folder.process()
+        (self.dst / ".digitized.png").hardlink_to(digitized)
+
+        report = folder.process([".digitized.png"])
+
+        self.assertEqual((2, 1), (report.pictures, report.renamed))
+        self.assertSameFile(original, "0.png")
+        self.assertSameFile(digitized, "1.png")
+
+    def test_report_conflicts_and_retry(self) -> None:
+        (self.dst / "original.png").hardlink_to(original)
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        (self.dst / "1.png").mkdir()
+        folder = WatchedFolder(self.dst)
+
+        self.assertIsInstance(folder.process().error, FileExistsError)
+        (self.dst / "1.png").rmdir()
+        report = folder.process([])
+
+        self.assertIsNone(report.error)
+        self.assertSameFile(digitized, "1.png")
+
+    def assertSameFile(self, expected: Path, filename: str) -> None:
+        self.assertTrue(expected.samefile(self.dst / filename), filename)
+
+
+@unittest.skipUnless(inotify_available(), "inotify is not available")
+class WatchTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.dst = Path(self.dir.name)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_read_events(self) -> None:
+        with Inotify() as inotify:
+            wd = inotify.add(self.dst)
+            (self.dst / "new.png").touch()
+
+            events = inotify.read(1)
+
+        self.assertIn(wd, [event[0] for event in events])
+        self.assertIn("new.png", [event[2] for event in events])
+
+    def test_sort_arrivals(self) -> None:
+        (self.dst / "digitized.png").hardlink_to(digitized)
+        reports = watch([self.dst], debounce=0.05)
+        self.assertEqual(1, next(reports).renamed)
+
+        (self.dst / "original.png").hardlink_to(original)
+        report = next(reports)
+
+        self.assertEqual((2, 2), (report.pictures, report.renamed))
+        self.assertTrue(original.samefile(self.dst / "0.png"))
+        self.assertTrue(digitized.samefile(self.dst / "1.png"))